@@ -1,3 +1,4 @@
 from app.api.videos import router as videos_router
+from app.api.batches import router as batches_router
 
-__all__ = ["videos_router"]
+__all__ = ["videos_router", "batches_router"]
@@ -0,0 +1,226 @@
+"""
+Batches API Router
+Submits whole product catalogs as one batch of video jobs.
+"""
+import io
+import csv
+import json
+import uuid
+import asyncio
+import zipfile
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.config import get_settings
+from app.models.video import VideoStatus
+from app.models.video_batch import VideoBatch
+from app.schemas.batch import BatchManifestItem, VideoBatchResponse
+from app.services.job_queue import job_queue
+from app.services.render_profiles import parse_aspect_ratios
+from app.services.upload_store import upload_store, UploadTooLargeError, ARCHIVE_PREFIX
+
+router = APIRouter(prefix="/api/batches", tags=["batches"])
+settings = get_settings()
+
+# Row errors reported back at once, so a bad manifest can be fixed in one round
+MAX_REPORTED_ERRORS = 20
+
+# Images referenced by content hash instead of an archive member
+SHA256_PREFIX = "sha256:"
+
+
+def _parse_manifest(data: bytes, filename: str) -> list[dict]:
+    """Read manifest rows from CSV (header row) or JSON (a list, or {"items": [...]})."""
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Manifest must be UTF-8")
+
+    if filename.lower().endswith(".json") or text.lstrip().startswith(("[", "{")):
+        try:
+            rows = json.loads(text)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON manifest: {e}")
+        if isinstance(rows, dict):
+            rows = rows.get("items")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise HTTPException(status_code=400, detail="JSON manifest must be a list of objects")
+        return rows
+
+    # Empty CSV cells fall back to the field defaults
+    return [
+        {key: value for key, value in row.items() if key and value not in (None, "")}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+def _validate_rows(rows: list[dict]) -> list[tuple[BatchManifestItem, list[str]]]:
+    """Validate every row up front; nothing is stored unless the whole manifest is valid."""
+    items, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        try:
+            item = BatchManifestItem.model_validate(row)
+            aspects = parse_aspect_ratios(",".join(item.renditions))
+        except ValidationError as e:
+            fields = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors()
+            )
+            errors.append(f"row {number}: {fields}")
+            continue
+        except ValueError as e:
+            errors.append(f"row {number}: {e}")
+            continue
+        items.append((item, aspects))
+
+    if errors:
+        raise HTTPException(status_code=400, detail=errors[:MAX_REPORTED_ERRORS])
+    return items
+
+
+def _resolve_images(items: list[tuple[BatchManifestItem, list[str]]], archive_file) -> list[list[str]]:
+    """
+    Check every row's images before anything is stored. Blocking.
+
+    `sha256:` references resolve to stored uploads right away; archive
+    members are recorded as ARCHIVE_PREFIX + name and stored by the job
+    that uses them. Only the archive's directory is read here.
+    """
+    members = {}
+    if archive_file is not None:
+        with zipfile.ZipFile(archive_file) as archive:
+            members = {info.filename: info.file_size for info in archive.infolist() if not info.is_dir()}
+
+    errors, paths = [], []
+    for number, (item, _) in enumerate(items, start=1):
+        row_paths = []
+        for ref in item.images:
+            if ref.startswith(SHA256_PREFIX):
+                path = upload_store.find(ref[len(SHA256_PREFIX):].lower())
+                if not path:
+                    errors.append(f"row {number}: unknown image {ref}")
+                row_paths.append(path)
+            elif ref not in members:
+                errors.append(f"row {number}: {ref} is not in the image archive")
+            elif members[ref] > settings.max_upload_bytes:
+                errors.append(f"row {number}: {ref} exceeds {settings.max_upload_bytes} bytes")
+            else:
+                row_paths.append(ARCHIVE_PREFIX + ref)
+        paths.append(row_paths)
+
+    if errors:
+        raise HTTPException(status_code=400, detail=errors[:MAX_REPORTED_ERRORS])
+    return paths
+
+
+def _batch_response(db: Session, batch: VideoBatch) -> VideoBatchResponse:
+    summary = job_queue.batch_counts(db, batch.id)
+    counts = summary["counts"]
+    return VideoBatchResponse(
+        id=batch.id,
+        name=batch.name,
+        total=batch.total,
+        counts=counts,
+        completed=counts.get(VideoStatus.DONE.value, 0) + counts.get(VideoStatus.FAILED.value, 0),
+        progress=summary["progress"],
+        created_at=batch.created_at
+    )
+
+
+@router.post("", response_model=VideoBatchResponse)
+async def create_batch(
+    manifest: UploadFile = File(..., description="CSV or JSON manifest, one video per row"),
+    images: Optional[UploadFile] = File(None, description="Zip archive of the images the manifest names"),
+    name: Optional[str] = Form(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a batch of video generation requests from a catalog manifest.
+
+    - **manifest**: Rows with `product_name`, `product_description`, `style`,
+      `renditions` ("9:16,1:1") and `images` (up to 3, ";"-separated in CSV).
+      An image is an archive member name or `sha256:<hash>` of an image
+      uploaded before.
+    - **images**: Zip archive with the referenced images (optional)
+    - **name**: Label for the batch
+
+    The whole manifest, image references included, is checked before
+    anything is stored. The archive is kept as uploaded and each job
+    normalizes its own images when it runs. All videos are inserted in one
+    bulk operation. Batch jobs are scheduled behind single-video requests
+    and share worker slots round-robin with other batches.
+    """
+    data = await manifest.read(settings.max_upload_bytes + 1)
+    if len(data) > settings.max_upload_bytes:
+        raise HTTPException(status_code=413, detail=f"Manifest exceeds {settings.max_upload_bytes} bytes")
+
+    rows = _parse_manifest(data, manifest.filename or "")
+    if not rows:
+        raise HTTPException(status_code=400, detail="Manifest has no rows")
+    if len(rows) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Manifest exceeds {settings.batch_max_items} videos per batch"
+        )
+
+    items = _validate_rows(rows)
+
+    archive_file = None
+    if images and images.filename:
+        if images.size is not None and images.size > settings.batch_max_archive_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Image archive exceeds {settings.batch_max_archive_bytes} bytes"
+            )
+        archive_file = images.file
+
+    try:
+        image_paths = await asyncio.to_thread(_resolve_images, items, archive_file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Image archive is not a valid zip file")
+
+    batch = VideoBatch(id=uuid.uuid4(), name=name)
+    uses_archive = any(path.startswith(ARCHIVE_PREFIX) for paths in image_paths for path in paths)
+    if uses_archive:
+        try:
+            await asyncio.to_thread(upload_store.stage_archive, archive_file, batch.id)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+    videos = [
+        {
+            "product_name": item.product_name,
+            "product_description": item.product_description,
+            "style": item.style.value,
+            "fresh_script": item.fresh_script,
+            "renditions": json.dumps([{"aspect_ratio": aspect} for aspect in aspects]),
+            "image_paths": json.dumps(paths) if paths else None,
+        }
+        for (item, aspects), paths in zip(items, image_paths)
+    ]
+
+    try:
+        batch = job_queue.enqueue_batch(db, batch, videos)
+    except Exception:
+        if uses_archive:
+            upload_store.discard_archive(batch.id)
+        raise
+    return _batch_response(db, batch)
+
+
+@router.get("/{batch_id}", response_model=VideoBatchResponse)
+async def get_batch(batch_id: str, db: Session = Depends(get_db)):
+    """Get a batch with its per-status counts and overall progress."""
+    try:
+        bid = uuid.UUID(batch_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid batch ID format")
+
+    batch = db.query(VideoBatch).filter(VideoBatch.id == bid).first()
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return _batch_response(db, batch)
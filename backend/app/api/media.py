@@ -0,0 +1,76 @@
+"""
+Media Delivery
+Range-aware, cache-validated responses for generated video files.
+"""
+import os
+from email.utils import parsedate_to_datetime
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class MediaFileResponse(FileResponse):
+    """
+    FileResponse tuned for large media.
+
+    Starlette already answers Range/If-Range requests (206, multipart ranges)
+    and sets a strong ETag plus Last-Modified from the file's stat. This adds
+    a Cache-Control policy; bodies are streamed in `chunk_size` reads.
+    """
+
+    chunk_size = settings.media_chunk_size
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.headers.setdefault("cache-control", f"public, max-age={settings.media_cache_max_age}")
+
+
+def is_not_modified(response_headers: Headers, request_headers: Headers) -> bool:
+    """Whether a conditional GET can be answered with 304 Not Modified."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        etag = response_headers.get("etag")
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or (etag is not None and any(
+            tag.removeprefix("W/") == etag for tag in tags
+        ))
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(last_modified)
+    except (TypeError, ValueError):
+        return False
+
+
+def media_response(request: Request, path: str, **kwargs) -> Response:
+    """Serve a media file, answering conditional GETs with 304."""
+    response = MediaFileResponse(path, stat_result=os.stat(path), **kwargs)
+    if request.method in ("GET", "HEAD") and is_not_modified(response.headers, request.headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+class MediaStaticFiles(StaticFiles):
+    """StaticFiles that serves files through MediaFileResponse."""
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        response = MediaFileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,72 @@
+"""
+Upload Limits
+Rejects oversized upload requests before their body is read.
+"""
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Room for the form fields and multipart headers around the files
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def upload_limits() -> dict[tuple[str, str], int]:
+    """Largest request body accepted by each upload endpoint, by (method, path)."""
+    return {
+        ("POST", "/api/videos"): settings.max_request_upload_bytes + MULTIPART_OVERHEAD,
+        ("POST", "/api/batches"): (
+            settings.batch_max_archive_bytes + settings.max_upload_bytes + MULTIPART_OVERHEAD
+        ),
+    }
+
+
+class UploadLimitMiddleware:
+    """
+    Enforces a body size limit per upload endpoint.
+
+    Starlette spools a whole multipart body to temporary files before the
+    endpoint runs, so the endpoints' own per-file checks come after the
+    upload has been written once already. A Content-Length over the limit
+    is answered with 413 right away; a body sent without one (chunked) is
+    counted as it is received and cut off with 413 once it passes the limit.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict[tuple[str, str], int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits.get((scope["method"], scope["path"].rstrip("/")))
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body exceeds {limit} bytes"
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Surfaces through the form parser as a regular 413 response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
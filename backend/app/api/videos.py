@@ -5,211 +5,58 @@ Handles video generation requests and status queries.
 import os
 import json
 import uuid
+import base64
 import asyncio
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import FileResponse
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, session_scope
 from app.core.config import get_settings
 from app.models.video import Video, VideoStatus, VideoStyle
-from app.schemas.video import VideoResponse, VideoStatusResponse
-from app.services import script_generator, tts_service, video_generator
+from app.models.job_event import JobEvent
+from app.schemas.video import (
+    VideoResponse,
+    VideoListItem,
+    VideoListResponse,
+    VideoStatusResponse,
+    JobEventResponse
+)
+from app.api.media import media_response
+from app.services.job_queue import job_queue
+from app.services.render_profiles import DEFAULT_ASPECT_RATIO, parse_aspect_ratios
+from app.services.upload_store import upload_store, UploadTooLargeError, InvalidImageError
+from app.services.status_stream import status_stream
+from app.services.thumbnailer import thumbnailer
 
 router = APIRouter(prefix="/api/videos", tags=["videos"])
 settings = get_settings()
 
+# Progress messages
+PROGRESS_MESSAGES = {
+    VideoStatus.PENDING.value: "Menunggu proses...",
+    VideoStatus.PROCESSING.value: "Memproses...",
+    VideoStatus.GENERATING_SCRIPT.value: "Membuat script review...",
+    VideoStatus.GENERATING_AUDIO.value: "Membuat voice over...",
+    VideoStatus.GENERATING_VIDEO.value: "Membuat video...",
+    VideoStatus.PREVIEW_READY.value: "Preview siap!",
+    VideoStatus.DONE.value: "Video siap!",
+    VideoStatus.FAILED.value: "Gagal membuat video"
+}
 
-async def process_video_generation(video_id: str, db_url: str):
-    """Background task to process video generation with Veo 3 AI."""
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import sessionmaker
-    from app.services.veo3_generator import veo3_generator
-    from moviepy import VideoFileClip, AudioFileClip, concatenate_videoclips
-    
-    engine = create_engine(db_url)
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
-    
-    try:
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if not video:
-            return
-        
-        # Step 1: Generate script
-        video.status = VideoStatus.GENERATING_SCRIPT.value
-        db.commit()
-        
-        script_sections = await script_generator.generate_script(
-            video.product_name,
-            video.product_description or "",
-            video.style
-        )
-        video.script = script_sections.get("full_script", "")
-        db.commit()
-        
-        # Step 2: Generate audio (voice over)
-        video.status = VideoStatus.GENERATING_AUDIO.value
-        db.commit()
-        
-        audio_path = await tts_service.generate_audio(
-            script_sections.get("full_script", ""),
-            voice="female",
-            video_id=str(video.id)
-        )
-        video.audio_url = audio_path
-        db.commit()
-        
-        # Step 3: Generate AI video with Veo 3
-        video.status = VideoStatus.GENERATING_VIDEO.value
-        db.commit()
-        
-        image_paths = json.loads(video.image_paths) if video.image_paths else []
-        
-        generated_clips = []
-        
-        if image_paths:
-            # Generate video from each image (max 2 for cost efficiency)
-            scene_types = ["intro", "main", "outro"]
-            for i, img_path in enumerate(image_paths[:2]):
-                scene_type = scene_types[min(i, len(scene_types)-1)]
-                
-                # Build prompt for this scene
-                prompt = veo3_generator.build_product_video_prompt(
-                    video.product_name,
-                    video.product_description or "",
-                    video.style,
-                    scene_type
-                )
-                
-                try:
-                    clip_path = await veo3_generator.generate_video_from_image(
-                        image_path=img_path,
-                        prompt=prompt,
-                        video_id=f"{video.id}_{i}",
-                        aspect_ratio="9:16",
-                        duration_seconds=4  # 4 seconds per clip to save cost
-                    )
-                    generated_clips.append(clip_path)
-                except Exception as e:
-                    print(f"Veo 3 generation failed for clip {i}: {e}")
-                    # Fallback to MoviePy slideshow for this clip
-                    fallback_path = await video_generator.generate_video(
-                        video_id=f"{video.id}_{i}_fallback",
-                        image_paths=[img_path],
-                        audio_path=audio_path,
-                        script_sections={"hook": script_sections.get("hook", "")},
-                        style=video.style
-                    )
-                    generated_clips.append(fallback_path)
-        else:
-            # Text-to-video only (no image)
-            prompt = veo3_generator.build_product_video_prompt(
-                video.product_name,
-                video.product_description or "",
-                video.style,
-                "main"
-            )
-            
-            try:
-                clip_path = await veo3_generator.generate_video_from_text(
-                    prompt=prompt,
-                    video_id=str(video.id),
-                    aspect_ratio="9:16",
-                    duration_seconds=8
-                )
-                generated_clips.append(clip_path)
-            except Exception as e:
-                print(f"Text-to-video failed: {e}")
-                # Fallback
-                fallback_path = await video_generator.generate_video(
-                    video_id=str(video.id),
-                    image_paths=[],
-                    audio_path=audio_path,
-                    script_sections=script_sections,
-                    style=video.style
-                )
-                generated_clips.append(fallback_path)
-        
-        # Step 4: Combine clips and add audio
-        if len(generated_clips) == 1:
-            final_video_path = generated_clips[0]
-        else:
-            # Concatenate multiple clips
-            clips = [VideoFileClip(p) for p in generated_clips]
-            combined = concatenate_videoclips(clips, method="compose")
-            
-            final_video_path = os.path.join(settings.output_dir, f"{video.id}_combined.mp4")
-            combined.write_videofile(
-                final_video_path, 
-                codec="libx264",
-                audio_codec="aac",
-                fps=30
-            )
-            
-            # Cleanup
-            for clip in clips:
-                clip.close()
-            combined.close()
-        
-        # Add voice over to final video
-        try:
-            video_clip = VideoFileClip(final_video_path)
-            audio_clip = AudioFileClip(audio_path)
-            
-            # If audio is longer than video, trim audio
-            if audio_clip.duration > video_clip.duration:
-                audio_clip = audio_clip.subclipped(0, video_clip.duration)
-            
-            # If video is longer than audio, that's fine (silent end)
-            final_with_audio = video_clip.with_audio(audio_clip)
-            
-            output_path = os.path.join(settings.output_dir, f"{video.id}.mp4")
-            final_with_audio.write_videofile(
-                output_path,
-                codec="libx264",
-                audio_codec="aac",
-                fps=30
-            )
-            
-            video_clip.close()
-            audio_clip.close()
-            final_with_audio.close()
-            
-            video.video_url = output_path
-        except Exception as e:
-            print(f"Audio merge failed: {e}")
-            video.video_url = final_video_path
-        
-        video.status = VideoStatus.DONE.value
-        
-        # Create thumbnail
-        if image_paths:
-            thumb_path = await video_generator.create_thumbnail(
-                image_paths[0], 
-                str(video.id)
-            )
-            video.thumbnail_url = thumb_path
-        
-        db.commit()
-        
-    except Exception as e:
-        video.status = VideoStatus.FAILED.value
-        video.error_message = str(e)
-        db.commit()
-        print(f"Video generation failed: {e}")
-    finally:
-        db.close()
-
+FINAL_STATUSES = {VideoStatus.DONE.value, VideoStatus.FAILED.value}
 
 
 @router.post("", response_model=VideoResponse)
 async def create_video(
-    background_tasks: BackgroundTasks,
     product_name: str = Form(...),
     product_description: str = Form(None),
     style: str = Form("minimal"),
+    fresh_script: bool = Form(False),
+    renditions: str = Form(DEFAULT_ASPECT_RATIO),
     images: List[UploadFile] = File(None),
     db: Session = Depends(get_db)
 ):
@@ -219,6 +66,8 @@ async def create_video(
     - **product_name**: Name of the product
     - **product_description**: Description and key features
     - **style**: Video style (luxury, minimal, tech, lifestyle)
+    - **fresh_script**: Generate a new script instead of reusing a cached one
+    - **renditions**: Comma-separated aspect ratios, primary first (9:16, 1:1, 4:5, 16:9)
     - **images**: Product images (optional, up to 3)
     """
     # Validate style
@@ -227,43 +76,222 @@ async def create_video(
     except ValueError:
         video_style = VideoStyle.MINIMAL
     
-    # Save uploaded images
+    # Validate renditions
+    try:
+        aspects = parse_aspect_ratios(renditions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Stream uploaded images to disk, normalized and deduplicated by content
     image_paths = []
     if images:
-        os.makedirs(settings.upload_dir, exist_ok=True)
-        for i, img in enumerate(images[:3]):  # Max 3 images
-            if img.filename:
-                ext = os.path.splitext(img.filename)[1] or ".jpg"
-                filename = f"{uuid.uuid4()}{ext}"
-                filepath = os.path.join(settings.upload_dir, filename)
-                
-                with open(filepath, "wb") as f:
-                    content = await img.read()
-                    f.write(content)
-                
-                image_paths.append(filepath)
+        request_budget = settings.max_request_upload_bytes
+        try:
+            for i, img in enumerate(images[:3]):  # Max 3 images
+                if img.filename:
+                    stored = await upload_store.save(img, request_budget)
+                    request_budget -= stored["size"]
+                    image_paths.append(stored["path"])
+        except (UploadTooLargeError, InvalidImageError) as e:
+            # Stored images are kept: another request may already share them by content hash
+            status_code = 413 if isinstance(e, UploadTooLargeError) else 400
+            raise HTTPException(status_code=status_code, detail=str(e))
     
-    # Create video record
+    # Create video record; workers pick it up from the queue
     video = Video(
         product_name=product_name,
         product_description=product_description,
         style=video_style.value,
-        status=VideoStatus.PENDING.value,
+        fresh_script=fresh_script,
+        renditions=json.dumps([{"aspect_ratio": aspect} for aspect in aspects]),
         image_paths=json.dumps(image_paths) if image_paths else None
     )
     
-    db.add(video)
-    db.commit()
-    db.refresh(video)
+    return job_queue.enqueue(db, video)
+
+
+def _encode_cursor(created_at: datetime, video_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(video_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, video_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(video_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", response_model=VideoListResponse)
+async def list_videos(
+    status: Optional[List[str]] = Query(None),
+    style: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    batch_id: Optional[uuid.UUID] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List videos, newest first.
+    
+    - **status**: Only these statuses (repeat the parameter for several)
+    - **style**: Only this style
+    - **created_after** / **created_before**: Creation time range
+    - **batch_id**: Only videos of this batch
+    - **limit**: Page size (max 100)
+    - **cursor**: `next_cursor` from the previous page
+    """
+    # Keyset pagination on (created_at, id): every page is an index range scan
+    query = db.query(*(getattr(Video, name) for name in VideoListItem.model_fields))
+    
+    if status:
+        query = query.filter(Video.status.in_(status))
+    if style:
+        query = query.filter(Video.style == style)
+    if created_after:
+        query = query.filter(Video.created_at >= created_after)
+    if created_before:
+        query = query.filter(Video.created_at < created_before)
+    if batch_id:
+        query = query.filter(Video.batch_id == batch_id)
+    if cursor:
+        query = query.filter(tuple_(Video.created_at, Video.id) < _decode_cursor(cursor))
     
-    # Start background processing
-    background_tasks.add_task(
-        process_video_generation,
-        str(video.id),
-        settings.database_url
+    rows = query.order_by(Video.created_at.desc(), Video.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return VideoListResponse(
+        items=[VideoListItem.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
+
+
+def _status_response(video) -> VideoStatusResponse:
+    return VideoStatusResponse(
+        id=video.id,
+        status=video.status,
+        video_url=video.video_url,
+        preview_url=video.preview_url,
+        error_message=video.error_message,
+        progress=video.progress or 0,
+        progress_message=PROGRESS_MESSAGES.get(video.status, ""),
+        awaiting_final=video.status == VideoStatus.PREVIEW_READY.value and video.claimed_by is None
     )
+
+
+def _load_statuses(video_ids: List[uuid.UUID]) -> tuple[dict, set]:
+    """
+    Current status of each video, keyed by string ID, and the IDs whose job
+    is not running (finished, or stopped at its preview until /finalize).
+    """
+    with session_scope() as db:
+        rows = db.query(
+            Video.id,
+            Video.status,
+            Video.video_url,
+            Video.preview_url,
+            Video.error_message,
+            Video.progress,
+            Video.claimed_by
+        ).filter(Video.id.in_(video_ids)).all()
     
-    return video
+    states = {str(row.id): _status_response(row) for row in rows}
+    settled = {
+        key for key, state in states.items()
+        if state.status in FINAL_STATUSES or state.awaiting_final
+    }
+    return states, settled
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.get("/stream")
+async def stream_video_status(request: Request, ids: str = Query(..., description="Comma-separated video IDs")):
+    """
+    Stream status and progress for one or more videos as Server-Sent Events.
+    
+    Sends the current status of every video first, then a `status` event on
+    each change, and closes once every job has stopped running (done,
+    failed, or waiting at its preview for /finalize).
+    
+    The database is read once for the initial snapshot; after that each
+    state is updated from the job events, which carry the status, progress
+    and any URLs or error message written with them.
+    """
+    try:
+        video_ids = list(dict.fromkeys(uuid.UUID(v.strip()) for v in ids.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid video ID format")
+    
+    if not video_ids:
+        raise HTTPException(status_code=400, detail="No video IDs given")
+    if len(video_ids) > settings.status_stream_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.status_stream_max_ids} videos per stream"
+        )
+    
+    keys = [str(v) for v in video_ids]
+    # Subscribe before reading the snapshot so no transition is missed in between
+    queue = status_stream.subscribe(keys)
+    try:
+        states, settled = await asyncio.to_thread(_load_statuses, video_ids)
+    except Exception:
+        status_stream.unsubscribe(queue, keys)
+        raise
+    if len(states) != len(keys):
+        status_stream.unsubscribe(queue, keys)
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    async def events():
+        try:
+            for state in states.values():
+                yield _sse("status", state.model_dump_json())
+            
+            following = set(states) - settled
+            while following and not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.status_stream_ping)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                
+                key = event["video_id"]
+                if key not in following:
+                    continue
+                
+                state = states[key]
+                for name, value in event["fields"].items():
+                    setattr(state, name, value)
+                if event["status"]:
+                    state.status = event["status"]
+                    state.progress_message = PROGRESS_MESSAGES.get(state.status, "")
+                if event["progress"] is not None:
+                    # Stages overlap, so events can arrive with a lower figure
+                    state.progress = max(state.progress, event["progress"])
+                if event["event"] in ("done", "failed"):
+                    state.awaiting_final = state.status == VideoStatus.PREVIEW_READY.value
+                    following.discard(key)
+                
+                yield _sse("status", state.model_dump_json())
+        finally:
+            status_stream.unsubscribe(queue, keys)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
@@ -293,29 +321,58 @@ async def get_video_status(video_id: str, db: Session = Depends(get_db)):
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
-    # Progress messages
-    progress_messages = {
-        VideoStatus.PENDING.value: "Menunggu proses...",
-        VideoStatus.PROCESSING.value: "Memproses...",
-        VideoStatus.GENERATING_SCRIPT.value: "Membuat script review...",
-        VideoStatus.GENERATING_AUDIO.value: "Membuat voice over...",
-        VideoStatus.GENERATING_VIDEO.value: "Membuat video...",
-        VideoStatus.DONE.value: "Video siap!",
-        VideoStatus.FAILED.value: "Gagal membuat video"
-    }
+    return _status_response(video)
+
+
+@router.get("/{video_id}/events", response_model=List[JobEventResponse])
+async def get_video_events(video_id: str, db: Session = Depends(get_db)):
+    """Get the stage timeline (start/finish events and progress) of a video job."""
+    try:
+        vid = uuid.UUID(video_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid video ID format")
     
-    return VideoStatusResponse(
-        id=video.id,
-        status=video.status,
-        video_url=video.video_url,
-        error_message=video.error_message,
-        progress_message=progress_messages.get(video.status, "")
+    if not db.query(Video.id).filter(Video.id == vid).first():
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    return (
+        db.query(JobEvent)
+        .filter(JobEvent.video_id == vid)
+        .order_by(JobEvent.created_at, JobEvent.id)
+        .all()
     )
 
 
+@router.post("/{video_id}/finalize", response_model=VideoResponse)
+async def finalize_video(video_id: str, db: Session = Depends(get_db)):
+    """Queue the final high-quality render of a video that stopped at its preview."""
+    try:
+        vid = uuid.UUID(video_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid video ID format")
+    
+    video = db.query(Video).filter(Video.id == vid).first()
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    if video.status != VideoStatus.PREVIEW_READY.value or video.claimed_by:
+        raise HTTPException(status_code=409, detail="Video is not waiting for a final render")
+    
+    return job_queue.request_final(db, video)
+
+
 @router.get("/{video_id}/download")
-async def download_video(video_id: str, db: Session = Depends(get_db)):
-    """Download the generated video."""
+async def download_video(
+    video_id: str,
+    request: Request,
+    aspect_ratio: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Download the generated video (supports Range and conditional requests).
+    
+    - **aspect_ratio**: Rendition to download (defaults to the primary one)
+    """
     try:
         vid = uuid.UUID(video_id)
     except ValueError:
@@ -328,11 +385,56 @@ async def download_video(video_id: str, db: Session = Depends(get_db)):
     if video.status != VideoStatus.DONE.value:
         raise HTTPException(status_code=400, detail="Video is not ready yet")
     
-    if not video.video_url or not os.path.exists(video.video_url):
+    video_url = video.video_url
+    filename = f"{video.product_name.replace(' ', '_')}_review.mp4"
+    if aspect_ratio:
+        rendition = next(
+            (r for r in json.loads(video.renditions or "[]") if r["aspect_ratio"] == aspect_ratio),
+            None
+        )
+        if not rendition:
+            raise HTTPException(status_code=404, detail="Rendition not found")
+        video_url = rendition.get("video_url")
+        filename = f"{video.product_name.replace(' ', '_')}_review_{aspect_ratio.replace(':', 'x')}.mp4"
+    
+    if not video_url or not os.path.exists(video_url):
         raise HTTPException(status_code=404, detail="Video file not found")
     
-    return FileResponse(
-        video.video_url,
+    return media_response(
+        request,
+        video_url,
         media_type="video/mp4",
-        filename=f"{video.product_name.replace(' ', '_')}_review.mp4"
+        filename=filename
+    )
+
+
+@router.get("/{video_id}/thumbnail")
+async def get_video_thumbnail(
+    video_id: str,
+    request: Request,
+    width: Optional[int] = Query(None, ge=1, description="Width in pixels (rounded, capped at the poster)"),
+    format: Literal["webp", "jpeg"] = "webp",
+    db: Session = Depends(get_db)
+):
+    """
+    Get a thumbnail of the video's poster frame.
+    
+    - **width**: Width in pixels (defaults to the standard thumbnail size)
+    - **format**: webp or jpeg
+    """
+    try:
+        vid = uuid.UUID(video_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid video ID format")
+    
+    video = db.query(Video).filter(Video.id == vid).first()
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    if not video.poster_url or not os.path.exists(video.poster_url):
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    
+    path = await asyncio.to_thread(
+        thumbnailer.get_thumbnail, str(video.id), video.poster_url, width, format
     )
+    return media_response(request, path, media_type=thumbnailer.FORMATS[format][2])
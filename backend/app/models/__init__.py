@@ -1,3 +1,5 @@
 from app.models.video import Video, VideoStatus, VideoStyle
+from app.models.job_event import JobEvent
+from app.models.video_batch import VideoBatch
 
-__all__ = ["Video", "VideoStatus", "VideoStyle"]
+__all__ = ["Video", "VideoStatus", "VideoStyle", "JobEvent", "VideoBatch"]
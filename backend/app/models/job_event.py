@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class JobEvent(Base):
+    """Append-only progress event emitted while a video job runs."""
+    
+    __tablename__ = "job_events"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    video_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("videos.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    stage = Column(String(30), nullable=True)
+    event = Column(String(20), nullable=False)  # start, finish, progress, done, failed
+    status = Column(String(30), nullable=True)  # video status when the event was emitted
+    progress = Column(Integer, nullable=True)  # overall job progress, 0-100
+    message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<JobEvent {self.video_id} {self.stage}:{self.event}>"
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, Enum
+from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, Enum, Index, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 import enum
 
@@ -13,6 +13,7 @@ class VideoStatus(str, enum.Enum):
     GENERATING_SCRIPT = "generating_script"
     GENERATING_AUDIO = "generating_audio"
     GENERATING_VIDEO = "generating_video"
+    PREVIEW_READY = "preview_ready"  # preview playable; final render running or on demand
     DONE = "done"
     FAILED = "failed"
 
@@ -28,17 +29,37 @@ class Video(Base):
     """Video model for storing video generation requests."""
     
     __tablename__ = "videos"
+    __table_args__ = (
+        # Newest-first listing and its keyset cursor, with and without a status filter
+        Index("ix_videos_created_at_id", "created_at", "id"),
+        Index("ix_videos_status_created_at_id", "status", "created_at", "id"),
+        # Queue order: single requests first, then batches round-robin by position
+        Index("ix_videos_status_batch_position_created_at", "status", "batch_position", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     product_name = Column(String(255), nullable=False)
     product_description = Column(Text, nullable=True)
     style = Column(String(50), default=VideoStyle.MINIMAL.value)
     status = Column(String(30), default=VideoStatus.PENDING.value)
+    progress = Column(Integer, default=0, nullable=False)  # percent, updated at checkpoints
+    fresh_script = Column(Boolean, default=False)  # bypass the script cache
+    final_requested = Column(Boolean, default=False)  # render the final tier in on_demand mode
+    batch_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("video_batches.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+    batch_position = Column(Integer, default=0, nullable=False)  # 0 for single requests, 1-based in a batch
     
     # Generated content
     script = Column(Text, nullable=True)
     audio_url = Column(Text, nullable=True)
     video_url = Column(Text, nullable=True)
+    preview_url = Column(Text, nullable=True)
+    renditions = Column(Text, nullable=True)  # JSON list of {aspect_ratio, width, height, video_url}
+    poster_url = Column(Text, nullable=True)  # full-size poster frame; thumbnails are cut from it
     thumbnail_url = Column(Text, nullable=True)
     
     # Image paths (stored as JSON string)
@@ -47,6 +68,11 @@ class Video(Base):
     # Error handling
     error_message = Column(Text, nullable=True)
     
+    # Job queue bookkeeping
+    attempts = Column(Integer, default=0, nullable=False)
+    claimed_by = Column(String(255), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,21 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class VideoBatch(Base):
+    """A group of video jobs submitted together from a catalog manifest."""
+    
+    __tablename__ = "video_batches"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(255), nullable=True)
+    total = Column(Integer, nullable=False)  # videos in the batch
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_claimed_at = Column(DateTime, nullable=True)  # round-robin turn among batches
+    
+    def __repr__(self):
+        return f"<VideoBatch {self.id}: {self.total} videos>"
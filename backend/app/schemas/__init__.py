@@ -1,13 +1,24 @@
 from app.schemas.video import (
     VideoCreateRequest,
     VideoResponse,
+    Rendition,
+    VideoListItem,
+    VideoListResponse,
     VideoStatusResponse,
+    JobEventResponse,
     HealthResponse
 )
+from app.schemas.batch import BatchManifestItem, VideoBatchResponse
 
 __all__ = [
     "VideoCreateRequest",
     "VideoResponse", 
+    "Rendition",
+    "VideoListItem",
+    "VideoListResponse",
     "VideoStatusResponse",
-    "HealthResponse"
+    "JobEventResponse",
+    "HealthResponse",
+    "BatchManifestItem",
+    "VideoBatchResponse"
 ]
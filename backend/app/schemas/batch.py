@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+from typing import Optional, List, Dict
+from datetime import datetime
+from uuid import UUID
+
+from app.schemas.video import VideoCreateRequest
+
+
+class BatchManifestItem(VideoCreateRequest):
+    """One row of a batch manifest."""
+    # Archive member names, or "sha256:<hash>" of an image uploaded before
+    images: List[str] = Field(default_factory=list, max_length=3)
+    
+    @field_validator("renditions", "images", mode="before")
+    @classmethod
+    def split_list(cls, value, info: ValidationInfo):
+        # CSV cells hold lists as strings: "9:16,1:1" and "front.jpg;back.jpg"
+        if isinstance(value, str):
+            separator = ";" if info.field_name == "images" else ","
+            return [part.strip() for part in value.split(separator) if part.strip()]
+        return value
+
+
+class VideoBatchResponse(BaseModel):
+    """A batch of videos with its aggregate progress."""
+    id: UUID
+    name: Optional[str]
+    total: int
+    counts: Dict[str, int] = {}  # videos per status
+    completed: int = 0  # done or failed
+    progress: int = 0  # 0-100 across the whole batch
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+import json
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
@@ -11,6 +12,16 @@ class VideoCreateRequest(BaseModel):
     product_name: str = Field(..., min_length=1, max_length=255)
     product_description: Optional[str] = None
     style: VideoStyle = VideoStyle.MINIMAL
+    fresh_script: bool = False
+    renditions: List[str] = ["9:16"]
+
+
+class Rendition(BaseModel):
+    """One aspect ratio of a video."""
+    aspect_ratio: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    video_url: Optional[str] = None
 
 
 class VideoResponse(BaseModel):
@@ -20,25 +31,75 @@ class VideoResponse(BaseModel):
     product_description: Optional[str]
     style: str
     status: str
+    progress: int = 0
     script: Optional[str]
     audio_url: Optional[str]
     video_url: Optional[str]
+    preview_url: Optional[str] = None
+    renditions: Optional[List[Rendition]] = None
+    batch_id: Optional[UUID] = None
+    poster_url: Optional[str] = None
     thumbnail_url: Optional[str]
     error_message: Optional[str]
     created_at: datetime
     updated_at: datetime
     
+    @field_validator("renditions", mode="before")
+    @classmethod
+    def parse_renditions(cls, value):
+        # Stored as a JSON string on the model
+        return json.loads(value) if isinstance(value, str) else value
+    
     class Config:
         from_attributes = True
 
 
+class VideoListItem(BaseModel):
+    """Lightweight projection of a video for listings."""
+    id: UUID
+    product_name: str
+    style: str
+    status: str
+    progress: int = 0
+    video_url: Optional[str]
+    preview_url: Optional[str] = None
+    thumbnail_url: Optional[str]
+    batch_id: Optional[UUID] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class VideoListResponse(BaseModel):
+    """One page of videos, newest first."""
+    items: List[VideoListItem]
+    next_cursor: Optional[str] = None
+
+
 class VideoStatusResponse(BaseModel):
     """Response model for video status check."""
     id: UUID
     status: str
     video_url: Optional[str]
+    preview_url: Optional[str] = None
     error_message: Optional[str]
+    progress: int = 0
     progress_message: str = ""
+    awaiting_final: bool = False  # stopped at its preview until /finalize
+
+
+class JobEventResponse(BaseModel):
+    """Response model for a job progress event."""
+    stage: Optional[str]
+    event: str
+    status: Optional[str]
+    progress: Optional[int]
+    message: Optional[str]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
 
 
 class HealthResponse(BaseModel):
@@ -1,9 +1,13 @@
 from app.services.script_generator import script_generator, ScriptGenerator
 from app.services.tts_service import tts_service, TTSService
 from app.services.video_generator import video_generator, VideoGenerator
+from app.services.job_queue import job_queue, JobQueue
+from app.services.progress_bus import progress_bus, ProgressBus
 
 __all__ = [
     "script_generator", "ScriptGenerator",
     "tts_service", "TTSService", 
-    "video_generator", "VideoGenerator"
+    "video_generator", "VideoGenerator",
+    "job_queue", "JobQueue",
+    "progress_bus", "ProgressBus"
 ]
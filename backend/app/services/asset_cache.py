@@ -0,0 +1,67 @@
+"""
+Asset Cache Service
+Bounded LRU cache for pre-rendered, reusable render assets.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class AssetCache:
+    """
+    LRU cache of immutable assets with hit/miss counters.
+
+    Cached values are shared between callers and must not be modified in
+    place; callers that draw on an asset take a copy first.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached asset for key, building it with factory on a miss."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+
+        value = factory()
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Cache counters for sizing."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._items),
+                "max_items": self.max_items,
+            }
+
+
+# Singleton instance
+asset_cache = AssetCache(settings.asset_cache_size)
@@ -0,0 +1,117 @@
+"""
+Base64 Streaming Helpers
+Incremental base64 encode/decode for large media fields inside JSON bodies.
+"""
+import re
+import base64
+import binascii
+from typing import AsyncIterator, BinaryIO, Optional
+import aiofiles
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+async def iter_base64_file(path: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Yield the base64 encoding of a file without holding the whole file in memory."""
+    chunk_size = chunk_size or settings.veo_stream_chunk_size
+    # Read in multiples of 3 bytes so every chunk encodes without padding
+    chunk_size -= chunk_size % 3
+
+    async with aiofiles.open(path, "rb") as f:
+        while True:
+            chunk = await f.read(chunk_size)
+            if not chunk:
+                break
+            yield base64.standard_b64encode(chunk)
+
+
+def base64_length(size: int) -> int:
+    """Length of the padded base64 encoding of `size` bytes."""
+    return 4 * ((size + 2) // 3)
+
+
+class Base64FieldExtractor:
+    """
+    Streams one base64 string field out of a JSON body into a file.
+
+    Feed the raw response body chunk by chunk. The value of the first
+    `field` string is decoded incrementally and written to `sink`; the rest
+    of the body is kept (with the value emptied) so the small JSON envelope
+    can be parsed once the body is complete.
+    """
+
+    def __init__(self, sink: BinaryIO, field: str = "bytesBase64Encoded"):
+        self.sink = sink
+        self._key = re.compile(rb'"' + re.escape(field.encode()) + rb'"\s*:\s*"')
+        self._envelope = bytearray()
+        self._pending = b""  # base64 characters not yet decoded (fewer than 4)
+        self._escape = False
+        self._inside = False
+        self.found = False
+        self.bytes_written = 0
+
+    def feed(self, chunk: bytes) -> None:
+        while chunk:
+            if self._inside:
+                chunk = self._feed_value(chunk)
+            elif self.found:
+                self._envelope += chunk
+                return
+            else:
+                start = len(self._envelope)
+                self._envelope += chunk
+                # Allow the key to straddle the previous chunk boundary
+                match = self._key.search(self._envelope, max(start - 64, 0))
+                if not match:
+                    return
+                chunk = bytes(self._envelope[match.end():])
+                del self._envelope[match.end():]
+                self._inside = True
+                self.found = True
+
+    def _feed_value(self, chunk: bytes) -> bytes:
+        """Consume value bytes; returns whatever follows the closing quote."""
+        # Base64 never contains a quote, so the first one closes the string
+        end = chunk.find(b'"')
+        value = chunk if end < 0 else chunk[:end]
+
+        if self._escape or b"\\" in value:
+            value = self._unescape(value)
+        if end >= 0:
+            self._inside = False
+
+        self._write(value, final=end >= 0)
+        return b"" if end < 0 else chunk[end:]
+
+    def _unescape(self, value: bytes) -> bytes:
+        """Drop JSON escapes; only an escaped slash carries base64 data."""
+        data = bytearray()
+        for byte in value:
+            if self._escape:
+                self._escape = False
+                if byte == ord("/"):
+                    data.append(byte)
+                continue
+            if byte == ord("\\"):
+                self._escape = True
+                continue
+            data.append(byte)
+        return bytes(data)
+
+    def _write(self, data: bytes, final: bool) -> None:
+        data = self._pending + data
+        usable = len(data) if final else len(data) - len(data) % 4
+        self._pending = data[usable:]
+
+        if usable:
+            try:
+                decoded = base64.standard_b64decode(data[:usable])
+            except binascii.Error as e:
+                raise ValueError(f"Invalid base64 data in response: {e}")
+            self.sink.write(decoded)
+            self.bytes_written += len(decoded)
+
+    def envelope(self) -> bytes:
+        """The JSON body with the streamed field's value removed."""
+        return bytes(self._envelope)
@@ -0,0 +1,214 @@
+"""
+Disk Cache
+Persistent file cache with TTL, size-bounded LRU eviction and hit statistics.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from typing import Optional
+
+
+class DiskCache:
+    """
+    Content-keyed file store under a single directory.
+
+    Entries are plain files named by key. The modification time records when
+    an entry was written (for TTL) and the access time is bumped on every hit
+    (for LRU eviction), so the cache survives restarts and can be shared by
+    every process on the host.
+
+    Eviction scans the whole directory, so writes do not run it every time:
+    it runs at most once per EVICT_INTERVAL seconds, or sooner once the
+    writes since the last scan add up to EVICT_SLACK of the budget. Between
+    scans the cache can run that much over budget.
+    """
+
+    EVICT_INTERVAL = 60.0
+    EVICT_SLACK = 0.05
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[int] = None
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._last_evict: Optional[float] = None
+        self._entries_since_evict = 0
+        self._bytes_since_evict = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key_for(*parts) -> str:
+        """Stable hash of the given key parts."""
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, suffix: str = "") -> str:
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def _expired(self, stat: os.stat_result, now: float) -> bool:
+        return self.ttl is not None and now - stat.st_mtime > self.ttl
+
+    def get_path(self, key: str, suffix: str = "") -> Optional[str]:
+        """Return the path of a live entry and mark it as recently used."""
+        path = self.path_for(key, suffix)
+        now = time.time()
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+
+        if stat is None or self._expired(stat, now):
+            if stat is not None:
+                self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path, (now, stat.st_mtime))
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def get_json(self, key: str) -> Optional[dict]:
+        path = self.get_path(key, ".json")
+        if not path:
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            self._remove(path)
+            return None
+
+    def put_bytes(self, key: str, data: bytes, suffix: str = "") -> str:
+        """Atomically write an entry and evict if the cache is over budget."""
+        path = self.path_for(key, suffix)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self._written(len(data))
+        return path
+
+    def put_json(self, key: str, value: dict) -> str:
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        return self.put_bytes(key, data, ".json")
+
+    def put_file(self, key: str, source_path: str, suffix: str = "") -> str:
+        """Add an existing file to the cache, hard-linking it when possible."""
+        path = self.path_for(key, suffix)
+        self._install(source_path, path)
+
+        self._written(os.path.getsize(path))
+        return path
+
+    def export(self, path: str, dest_path: str) -> str:
+        """Materialize a cached entry at dest_path, hard-linking when possible."""
+        self._install(path, dest_path)
+        return dest_path
+
+    @staticmethod
+    def _install(source_path: str, dest_path: str) -> None:
+        """Atomically place source_path at dest_path as a hard link or a copy."""
+        try:
+            if os.path.samefile(source_path, dest_path):
+                return
+        except FileNotFoundError:
+            pass
+
+        tmp_path = f"{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(source_path, tmp_path)
+        except OSError:
+            shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _written(self, size: int) -> None:
+        """Count a write and evict when a scan is due."""
+        now = time.monotonic()
+        with self._lock:
+            self._entries_since_evict += 1
+            self._bytes_since_evict += size
+            due = (
+                self._last_evict is None
+                or now - self._last_evict >= self.EVICT_INTERVAL
+                or (
+                    self.max_entries is not None
+                    and self._entries_since_evict > self.max_entries * self.EVICT_SLACK
+                )
+                or (
+                    self.max_bytes is not None
+                    and self._bytes_since_evict > self.max_bytes * self.EVICT_SLACK
+                )
+            )
+            if not due:
+                return
+            self._last_evict = now
+            self._entries_since_evict = 0
+            self._bytes_since_evict = 0
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones until within budget."""
+        now = time.time()
+        entries = []
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if self._expired(stat, now):
+                    self._remove(entry.path)
+                    continue
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (self.max_bytes is not None and total_bytes > self.max_bytes)
+        ):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_bytes -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,261 @@
+"""
+Job Queue Service
+Database-backed queue of video generation jobs.
+
+Jobs are rows of the `videos` table: a PENDING row is an enqueued job, and
+workers claim rows with `SELECT ... FOR UPDATE SKIP LOCKED` so that several
+worker processes can drain the queue without handing out the same job twice.
+
+Single requests are claimed before batch jobs, and batches take turns
+round-robin (the batch served longest ago goes next), so a large catalog
+batch neither starves interactive requests nor is starved by batches
+submitted after it.
+"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.video import Video, VideoStatus
+from app.models.video_batch import VideoBatch
+
+settings = get_settings()
+
+
+class JobQueue:
+    """Enqueue, claim and release video generation jobs."""
+
+    # Statuses a job can be in while a worker owns it
+    IN_PROGRESS = [
+        VideoStatus.PROCESSING.value,
+        VideoStatus.GENERATING_SCRIPT.value,
+        VideoStatus.GENERATING_AUDIO.value,
+        VideoStatus.GENERATING_VIDEO.value,
+        VideoStatus.PREVIEW_READY.value,
+    ]
+
+    @staticmethod
+    def _ids(video_ids: list[str]) -> list[uuid.UUID]:
+        return [uuid.UUID(str(video_id)) for video_id in video_ids]
+
+    def enqueue(self, db: Session, video: Video) -> Video:
+        """Persist a new job. The API only enqueues; workers do the rendering."""
+        video.status = VideoStatus.PENDING.value
+        video.attempts = 0
+        db.add(video)
+        db.commit()
+        db.refresh(video)
+        return video
+
+    def enqueue_batch(self, db: Session, batch: VideoBatch, videos: list[dict]) -> VideoBatch:
+        """
+        Persist a batch and all its jobs in one bulk insert and one commit.
+
+        Args:
+            batch: The new batch
+            videos: Column values of each video, in manifest order
+        """
+        now = datetime.utcnow()
+        batch.total = len(videos)
+        batch.created_at = now
+        db.add(batch)
+        db.flush()
+
+        db.bulk_insert_mappings(Video, [
+            {
+                **fields,
+                "id": uuid.uuid4(),
+                "batch_id": batch.id,
+                "batch_position": position,
+                "status": VideoStatus.PENDING.value,
+                "attempts": 0,
+                "progress": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for position, fields in enumerate(videos, start=1)
+        ])
+        db.commit()
+        db.refresh(batch)
+        return batch
+
+    def batch_counts(self, db: Session, batch_id: uuid.UUID) -> dict:
+        """
+        Aggregate job state of a batch in one grouped query.
+
+        Returns:
+            dict with per-status 'counts' and overall 'progress' (0-100),
+            where finished and failed jobs count as complete
+        """
+        rows = (
+            db.query(Video.status, func.count(Video.id), func.coalesce(func.sum(Video.progress), 0))
+            .filter(Video.batch_id == batch_id)
+            .group_by(Video.status)
+            .all()
+        )
+
+        counts = {}
+        progress_sum = 0
+        finished = {VideoStatus.DONE.value, VideoStatus.FAILED.value}
+        for status, count, status_progress in rows:
+            counts[status] = count
+            progress_sum += count * 100 if status in finished else status_progress
+
+        total = sum(counts.values())
+        return {
+            "counts": counts,
+            "progress": progress_sum // total if total else 0
+        }
+
+    def claim_next(
+        self,
+        db: Session,
+        worker_id: str,
+        include_batches: bool = True
+    ) -> Optional[tuple[str, bool]]:
+        """
+        Claim the next runnable job.
+
+        A job is runnable when it is pending, or when it is in progress but its
+        owner stopped sending heartbeats (crashed or restarted worker). Single
+        requests come first, oldest first; batch jobs follow, one from each
+        batch in turn (least recently claimed batch first, in manifest order
+        within a batch).
+
+        Args:
+            include_batches: Whether batch jobs may be claimed
+
+        Returns:
+            (video ID, whether it belongs to a batch), or None if nothing is runnable
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.job_stale_after)
+
+        query = db.query(Video).outerjoin(VideoBatch, Video.batch_id == VideoBatch.id).filter(
+            or_(
+                Video.status == VideoStatus.PENDING.value,
+                and_(
+                    Video.status.in_(self.IN_PROGRESS),
+                    Video.claimed_at < stale_before
+                )
+            ),
+            Video.attempts < settings.job_max_attempts
+        )
+        if not include_batches:
+            query = query.filter(Video.batch_position == 0)
+
+        video = (
+            query
+            .order_by(
+                Video.batch_position > 0,
+                VideoBatch.last_claimed_at.asc().nullsfirst(),
+                Video.batch_position,
+                Video.created_at
+            )
+            .with_for_update(skip_locked=True, of=Video)
+            .first()
+        )
+
+        if not video:
+            db.rollback()
+            return None
+
+        claimed = str(video.id), video.batch_position > 0
+        video.status = VideoStatus.PROCESSING.value
+        video.claimed_by = worker_id
+        video.claimed_at = now
+        video.attempts = (video.attempts or 0) + 1
+        video.error_message = None
+        if video.batch_id:
+            # Move the batch to the back of the rotation
+            db.query(VideoBatch).filter(VideoBatch.id == video.batch_id).update(
+                {VideoBatch.last_claimed_at: now}, synchronize_session=False
+            )
+        db.commit()
+
+        return claimed
+
+    def heartbeat(self, db: Session, video_ids: list[str], worker_id: str) -> None:
+        """Refresh the claim on jobs this worker is still running."""
+        if not video_ids:
+            return
+
+        (
+            db.query(Video)
+            .filter(Video.id.in_(self._ids(video_ids)), Video.claimed_by == worker_id)
+            .update({Video.claimed_at: datetime.utcnow()}, synchronize_session=False)
+        )
+        db.commit()
+
+    def complete(self, db: Session, video_ids: list[str], worker_id: str) -> None:
+        """
+        Drop the claim on jobs whose run has ended.
+        
+        A job can stop in PREVIEW_READY (final render on demand); without a
+        claim it is not mistaken for a stale in-progress job.
+        """
+        if not video_ids:
+            return
+
+        (
+            db.query(Video)
+            .filter(Video.id.in_(self._ids(video_ids)), Video.claimed_by == worker_id)
+            .update({Video.claimed_by: None, Video.claimed_at: None}, synchronize_session=False)
+        )
+        db.commit()
+
+    def request_final(self, db: Session, video: Video) -> Video:
+        """Queue the final render of a job that stopped at its preview."""
+        video.final_requested = True
+        video.fresh_script = False  # reuse the script (and voice over) behind the preview
+        video.status = VideoStatus.PENDING.value
+        video.attempts = 0
+        db.commit()
+        db.refresh(video)
+        return video
+
+    def release(self, db: Session, video_ids: list[str], worker_id: str) -> None:
+        """Put interrupted jobs back on the queue without counting the attempt."""
+        if not video_ids:
+            return
+
+        (
+            db.query(Video)
+            .filter(
+                Video.id.in_(self._ids(video_ids)),
+                Video.claimed_by == worker_id,
+                Video.status.in_(self.IN_PROGRESS)
+            )
+            .update({
+                Video.status: VideoStatus.PENDING.value,
+                Video.claimed_by: None,
+                Video.claimed_at: None,
+                Video.attempts: Video.attempts - 1,
+            }, synchronize_session=False)
+        )
+        db.commit()
+
+    def fail_exhausted(self, db: Session) -> int:
+        """Mark stale jobs that used up all their attempts as failed."""
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.job_stale_after)
+
+        count = (
+            db.query(Video)
+            .filter(
+                Video.status.in_(self.IN_PROGRESS),
+                Video.claimed_at < stale_before,
+                Video.attempts >= settings.job_max_attempts
+            )
+            .update({
+                Video.status: VideoStatus.FAILED.value,
+                Video.error_message: "Job abandoned after too many attempts",
+            }, synchronize_session=False)
+        )
+        db.commit()
+        return count
+
+
+# Singleton instance
+job_queue = JobQueue()
@@ -0,0 +1,336 @@
+"""
+Media Encoder Service
+Drives ffmpeg directly for encodes where MoviePy's frame-by-frame pipe is wasteful.
+"""
+import os
+import re
+import subprocess
+from typing import Optional
+import numpy as np
+from PIL import Image
+from moviepy.config import FFMPEG_BINARY
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class MediaEncoder:
+    """Thin wrapper around the ffmpeg binary bundled with MoviePy."""
+    
+    # Audio codecs the MP4 muxer accepts as-is
+    MP4_AUDIO_CODECS = {"aac", "mp3"}
+    
+    # Put the moov atom first so playback can start before the whole file arrives
+    FASTSTART = ["-movflags", "+faststart"]
+
+    def __init__(self, ffmpeg_binary: str = FFMPEG_BINARY):
+        self.ffmpeg_binary = ffmpeg_binary
+
+    def _run(self, args: list[str], input: Optional[bytes] = None) -> subprocess.CompletedProcess:
+        """Run ffmpeg and raise with its error output on failure."""
+        cmd = [self.ffmpeg_binary, "-hide_banner", "-loglevel", "error", "-y", *args]
+        result = subprocess.run(cmd, input=input, capture_output=True)
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed ({result.returncode}): {stderr[-2000:]}")
+
+        return result
+
+    def encode_stills(
+        self,
+        frames: list[Image.Image],
+        durations: list[float],
+        output_path: str,
+        audio_path: Optional[str] = None,
+        fps: Optional[int] = None,
+        preset: str = "medium",
+        crf: int = 23
+    ) -> str:
+        """
+        Encode a slideshow of still frames.
+
+        Each frame is sent to ffmpeg once and timestamped at its scene start
+        (the last one is sent again as an end marker); the fps filter repeats
+        it until the next scene. The encoder sees identical frames, so CPU time
+        scales with the number of scenes rather than with duration x fps.
+
+        Args:
+            frames: One RGB image per scene, all the same size
+            durations: Seconds each frame stays on screen
+            output_path: Destination MP4 path
+            audio_path: Optional audio track to mux in
+            fps: Output frame rate (defaults to settings.video_fps)
+            preset: libx264 preset
+            crf: libx264 constant rate factor
+
+        Returns:
+            Path to the encoded video file
+        """
+        if not frames or len(frames) != len(durations):
+            raise ValueError("encode_stills needs one duration per frame")
+
+        fps = fps or settings.video_fps
+        width, height = frames[0].size
+        total_duration = sum(durations)
+
+        # Presentation time of each scene, plus the end marker, in seconds
+        starts = []
+        t = 0.0
+        for duration in durations:
+            starts.append(t)
+            t += duration
+        starts.append(total_duration)
+
+        pts_expr = "0"
+        for n in range(len(starts) - 1, 0, -1):
+            pts_expr = f"if(eq(N,{n}),{starts[n]:.6f},{pts_expr})"
+
+        # The 1 fps input has a 1/1 timebase; switch to a fine one first so
+        # fractional scene starts are not rounded down to whole seconds
+        video_filter = (
+            f"settb=AVTB,setpts='({pts_expr})/TB',"
+            f"fps={fps},format=yuv420p"
+        )
+
+        args = [
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}",
+            "-framerate", "1",
+            "-i", "pipe:0",
+        ]
+        if audio_path:
+            args += ["-i", audio_path]
+
+        args += [
+            "-vf", video_filter,
+            "-map", "0:v",
+        ]
+        if audio_path:
+            args += ["-map", "1:a", "-c:a", "aac"]
+
+        args += [
+            "-c:v", "libx264",
+            "-preset", preset,
+            "-crf", str(crf),
+            "-tune", "stillimage",
+            *self.FASTSTART,
+            "-t", f"{total_duration:.6f}",
+            output_path,
+        ]
+
+        raw = b"".join(
+            np.ascontiguousarray(np.asarray(frame.convert("RGB"))).tobytes()
+            for frame in [*frames, frames[-1]]
+        )
+        self._run(args, input=raw)
+
+        return output_path
+
+
+    def probe(self, path: str) -> dict:
+        """
+        Read stream information from a media file.
+
+        Returns:
+            dict with 'duration' and, when present, 'video_codec', 'width',
+            'height', 'fps', 'pix_fmt' and 'audio_codec'
+        """
+        result = subprocess.run(
+            [self.ffmpeg_binary, "-hide_banner", "-i", path],
+            capture_output=True
+        )
+        output = result.stderr.decode("utf-8", errors="replace")
+
+        info = {"duration": 0.0}
+
+        match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", output)
+        if match:
+            hours, minutes, seconds = match.groups()
+            info["duration"] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+        for line in output.splitlines():
+            line = line.strip()
+            if not line.startswith("Stream #"):
+                continue
+
+            video = re.search(r"Video: (\w+)", line)
+            if video and "video_codec" not in info:
+                info["video_codec"] = video.group(1)
+                size = re.search(r", (\d{2,5})x(\d{2,5})", line)
+                if size:
+                    info["width"], info["height"] = int(size.group(1)), int(size.group(2))
+                fps = re.search(r"(\d+(?:\.\d+)?) fps", line)
+                if fps:
+                    info["fps"] = float(fps.group(1))
+                pix_fmt = re.search(r"\b(yuv\w+|nv\d+|rgb\w+|gray\w*)\b", line)
+                if pix_fmt:
+                    info["pix_fmt"] = pix_fmt.group(1)
+
+            audio = re.search(r"Audio: (\w+)", line)
+            if audio and "audio_codec" not in info:
+                info["audio_codec"] = audio.group(1)
+
+        if "video_codec" not in info and "audio_codec" not in info:
+            raise RuntimeError(f"Could not read media info for {path}")
+
+        return info
+
+    def extract_frames(self, path: str, count: int, window: Optional[float] = None) -> list[Image.Image]:
+        """
+        Sample frames spread over the start of a video in one decode pass.
+
+        Args:
+            path: Video file to read
+            count: Number of frames to sample
+            window: Seconds from the start to sample over (defaults to the whole video)
+
+        Returns:
+            Up to `count` RGB frames at the video's own resolution
+        """
+        info = self.probe(path)
+        width, height = info.get("width"), info.get("height")
+        if not width or not height:
+            raise RuntimeError(f"No video stream in {path}")
+
+        duration = info["duration"] or 1.0
+        window = min(window or duration, duration)
+
+        result = self._run([
+            "-t", f"{window:.6f}",
+            "-i", path,
+            "-vf", f"fps={count / window:.6f}",
+            "-frames:v", str(count),
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "pipe:1",
+        ])
+
+        frame_bytes = width * height * 3
+        data = result.stdout
+        return [
+            Image.frombytes("RGB", (width, height), data[offset:offset + frame_bytes])
+            for offset in range(0, len(data) - frame_bytes + 1, frame_bytes)
+        ]
+
+    def _can_stream_copy(self, infos: list[dict], size: Optional[tuple[int, int]] = None) -> bool:
+        """
+        Clips can be joined without re-encoding when they share one H.264
+        format whose aspect ratio matches the requested output size.
+        """
+        first = infos[0]
+        keys = ("width", "height", "fps", "pix_fmt")
+
+        if size and (first.get("width") or 0) * size[1] != (first.get("height") or 0) * size[0]:
+            return False
+
+        for info in infos:
+            if info.get("video_codec") != "h264":
+                return False
+            if any(info.get(key) != first.get(key) for key in keys):
+                return False
+
+        return True
+
+    def finish(
+        self,
+        clip_paths: list[str],
+        output_path: str,
+        audio_path: Optional[str] = None,
+        preset: str = "medium",
+        crf: int = 23,
+        size: Optional[tuple[int, int]] = None,
+        fps: Optional[int] = None
+    ) -> str:
+        """
+        Join clips and attach the voice over in a single ffmpeg pass.
+
+        Compatible H.264 clips are concatenated and muxed by stream copy. Only
+        when codec, resolution, fps or pixel format differ, or the clips have
+        a different aspect ratio than `size`, are they re-encoded, once, to
+        the output format (letterboxed to fit). The audio track is
+        trimmed to the video length; a shorter track leaves a silent end.
+
+        Args:
+            clip_paths: Video clips in playback order
+            output_path: Destination MP4 path
+            audio_path: Optional voice over replacing the clips' own audio
+            preset: libx264 preset used if re-encoding is needed
+            crf: libx264 constant rate factor used if re-encoding is needed
+            size: (width, height) to re-encode to (defaults to the video settings)
+            fps: Frame rate to re-encode to (defaults to settings.video_fps)
+
+        Returns:
+            Path to the finished video file
+        """
+        if not clip_paths:
+            raise ValueError("finish needs at least one clip")
+
+        infos = [self.probe(path) for path in clip_paths]
+        total_duration = sum(info["duration"] for info in infos)
+        stream_copy = self._can_stream_copy(infos, size)
+
+        args = []
+        list_path = None
+
+        if stream_copy and len(clip_paths) > 1:
+            list_path = f"{output_path}.concat.txt"
+            with open(list_path, "w") as f:
+                for path in clip_paths:
+                    escaped = os.path.abspath(path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            args += ["-f", "concat", "-safe", "0", "-i", list_path]
+        elif stream_copy:
+            args += ["-i", clip_paths[0]]
+        else:
+            for path in clip_paths:
+                args += ["-i", path]
+
+        video_inputs = 1 if stream_copy else len(clip_paths)
+
+        if audio_path:
+            args += ["-i", audio_path]
+
+        if stream_copy:
+            args += ["-map", "0:v", "-c:v", "copy"]
+        else:
+            width, height = size or (settings.video_width, settings.video_height)
+            fps = fps or settings.video_fps
+            chains = []
+            for i in range(len(clip_paths)):
+                chains.append(
+                    f"[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                    f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,"
+                    f"fps={fps},format=yuv420p,setsar=1[v{i}]"
+                )
+            joined = "".join(f"[v{i}]" for i in range(len(clip_paths)))
+            chains.append(f"{joined}concat=n={len(clip_paths)}:v=1:a=0[outv]")
+            args += [
+                "-filter_complex", ";".join(chains),
+                "-map", "[outv]",
+                "-c:v", "libx264",
+                "-preset", preset,
+                "-crf", str(crf),
+            ]
+
+        if audio_path:
+            audio_codec = self.probe(audio_path).get("audio_codec")
+            args += ["-map", f"{video_inputs}:a"]
+            args += ["-c:a", "copy" if audio_codec in self.MP4_AUDIO_CODECS else "aac"]
+        else:
+            args += ["-an"]
+
+        args += [*self.FASTSTART, "-t", f"{total_duration:.6f}", output_path]
+
+        try:
+            self._run(args)
+        finally:
+            if list_path and os.path.exists(list_path):
+                os.remove(list_path)
+
+        return output_path
+
+
+# Singleton instance
+media_encoder = MediaEncoder()
@@ -0,0 +1,173 @@
+"""
+Progress Bus
+In-memory job progress events with a batched writer to the job_events table.
+"""
+import os
+import uuid
+import json
+import socket
+import asyncio
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy import text
+from app.core.config import get_settings
+from app.core.database import engine, session_scope
+from app.models.job_event import JobEvent
+
+settings = get_settings()
+
+# Tags NOTIFY payloads so a process can skip its own events
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+EventListener = Callable[[dict], None]
+
+# Record keys stored in job_events; `fields` only travels to listeners
+EVENT_COLUMNS = ("video_id", "stage", "event", "status", "progress", "message", "created_at")
+
+
+class ProgressBus:
+    """
+    Collects progress events from running jobs and writes them in batches.
+
+    `emit()` is cheap and never touches the database: events are buffered
+    and a background task inserts them with one statement every
+    `progress_flush_interval` seconds (or sooner once `progress_batch_size`
+    events are waiting). On Postgres each batch also NOTIFYs
+    `progress_channel` in the same transaction, so API processes can push
+    events to clients without querying for them; in-process listeners are
+    called from `emit()` directly. Events carry the video fields written
+    with them (URLs, error message), so subscribers never need to re-read
+    the row.
+    """
+
+    def __init__(self):
+        self._buffer: list[dict] = []
+        self._listeners: list[EventListener] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+
+    def emit(
+        self,
+        video_id,
+        event: str,
+        stage: Optional[str] = None,
+        status: Optional[str] = None,
+        progress: Optional[int] = None,
+        message: Optional[str] = None,
+        fields: Optional[dict] = None
+    ) -> dict:
+        """
+        Record a progress event for a job.
+
+        Args:
+            video_id: The job's video ID
+            event: start, finish, progress, done or failed
+            stage: Pipeline stage the event belongs to
+            status: Video status at the time of the event
+            progress: Overall job progress in percent
+            message: Optional detail
+            fields: Video columns written along with the event, e.g.
+                preview_url once the preview is ready
+
+        Returns:
+            The recorded event
+        """
+        record = {
+            "video_id": uuid.UUID(str(video_id)),
+            "stage": stage,
+            "event": event,
+            "status": status,
+            "progress": progress,
+            "message": message,
+            "fields": fields or {},
+            "created_at": datetime.utcnow()
+        }
+        self._buffer.append(record)
+        for listener in list(self._listeners):
+            listener(record)
+
+        self._ensure_running()
+        if len(self._buffer) >= settings.progress_batch_size:
+            self._wakeup.set()
+        return record
+
+    def add_listener(self, listener: EventListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: EventListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def flush(self) -> None:
+        """Write every buffered event now."""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception as e:
+            print(f"Failed to write {len(batch)} job events: {e}")
+
+    async def stop(self) -> None:
+        """Stop the writer task and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def _write(self, batch: list[dict]) -> None:
+        with session_scope() as db:
+            db.bulk_insert_mappings(
+                JobEvent,
+                [{key: record[key] for key in EVENT_COLUMNS} for record in batch]
+            )
+            if engine.dialect.name == "postgresql":
+                # Delivered on commit, after the rows are visible
+                db.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    [
+                        {"channel": settings.progress_channel, "payload": self._payload(record)}
+                        for record in batch
+                    ]
+                )
+        self.written += len(batch)
+
+    @staticmethod
+    def _payload(record: dict) -> str:
+        # NOTIFY payloads are limited to 8000 bytes
+        return json.dumps({
+            "origin": PROCESS_ID,
+            "video_id": str(record["video_id"]),
+            "stage": record["stage"],
+            "event": record["event"],
+            "status": record["status"],
+            "progress": record["progress"],
+            "message": (record["message"] or "")[:1000] or None,
+            "fields": {
+                key: value[:1000] if isinstance(value, str) else value
+                for key, value in record["fields"].items()
+            }
+        })
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=settings.progress_flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+# Singleton instance
+progress_bus = ProgressBus()
@@ -0,0 +1,97 @@
+"""
+Render Pool Service
+Bounded process pool for CPU-bound rendering and encoding work.
+"""
+import os
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def _run_and_report(fn: Callable[..., Any], *args, **kwargs) -> tuple[Any, int, dict]:
+    """Run a pool call and return its result with this process's asset cache counters."""
+    from app.services.asset_cache import asset_cache
+    result = fn(*args, **kwargs)
+    return result, os.getpid(), asset_cache.stats()
+
+
+class RenderPool:
+    """
+    Runs blocking MoviePy/PIL/ffmpeg work in worker processes.
+
+    Callers await `run()` from async code, so the event loop stays free while
+    frames render and videos encode. Exceptions raised in the worker process
+    are re-raised in the caller.
+
+    Each pool process has its own asset cache. Calls return that cache's
+    counters along with their result, so `cache_stats()` can report all
+    processes together.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache_stats: dict[int, dict] = {}  # pool process ID -> latest asset cache stats
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) in the pool and await its result.
+
+        Cancelling the awaiting task drops the call if it has not started yet;
+        a call that is already running finishes in its worker process and its
+        result is discarded.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self.executor, functools.partial(_run_and_report, fn, *args, **kwargs)
+        )
+
+        try:
+            result, pid, cache_stats = await future
+            self._cache_stats[pid] = cache_stats
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM kill); start a fresh pool for later calls
+            self.shutdown(wait=False)
+            raise
+
+    def cache_stats(self) -> dict:
+        """Asset cache counters summed over the pool processes that have reported."""
+        hits = sum(stats["hits"] for stats in self._cache_stats.values())
+        misses = sum(stats["misses"] for stats in self._cache_stats.values())
+        lookups = hits + misses
+        return {
+            "processes": len(self._cache_stats),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": sum(stats["size"] for stats in self._cache_stats.values()),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            self._cache_stats.clear()
+
+
+# Singleton instance
+render_pool = RenderPool(settings.render_pool_size)
@@ -0,0 +1,94 @@
+"""
+Render Profiles
+Output size and encoder settings for each render tier and aspect ratio.
+"""
+from dataclasses import dataclass
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Renditions a job can ask for, as (width, height) ratios
+ASPECT_RATIOS = {
+    "9:16": (9, 16),
+    "1:1": (1, 1),
+    "4:5": (4, 5),
+    "16:9": (16, 9),
+}
+
+DEFAULT_ASPECT_RATIO = "9:16"
+
+# Aspect ratios Veo 3 can generate natively
+VEO_ASPECT_RATIOS = ("9:16", "16:9")
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """How one tier is rendered and encoded."""
+    name: str
+    width: int
+    height: int
+    fps: int
+    preset: str  # libx264 preset
+    crf: int  # libx264 constant rate factor; higher is smaller and blurrier
+    aspect_ratio: str = DEFAULT_ASPECT_RATIO
+
+    @property
+    def scale(self) -> float:
+        """Size of the short side relative to the full-resolution layout."""
+        return min(self.width, self.height) / min(settings.video_width, settings.video_height)
+
+
+def _even(value: float) -> int:
+    # yuv420p needs even dimensions
+    return max(2, int(round(value / 2)) * 2)
+
+
+def rendition_size(aspect_ratio: str) -> tuple[int, int]:
+    """Full-resolution frame size for an aspect ratio, keeping the configured short side."""
+    if aspect_ratio not in ASPECT_RATIOS:
+        raise ValueError(f"Unsupported aspect ratio: {aspect_ratio}")
+
+    ratio_w, ratio_h = ASPECT_RATIOS[aspect_ratio]
+    if (ratio_w, ratio_h) == (9, 16):
+        return settings.video_width, settings.video_height
+
+    short = min(settings.video_width, settings.video_height)
+    if ratio_w <= ratio_h:
+        return short, _even(short * ratio_h / ratio_w)
+    return _even(short * ratio_w / ratio_h), short
+
+
+def parse_aspect_ratios(value: str) -> list[str]:
+    """Parse a comma-separated list of aspect ratios, primary first, without duplicates."""
+    aspects = list(dict.fromkeys(a.strip() for a in value.split(",") if a.strip()))
+    unsupported = [a for a in aspects if a not in ASPECT_RATIOS]
+    if unsupported:
+        raise ValueError(f"Unsupported aspect ratio(s): {', '.join(unsupported)}")
+    return aspects or [DEFAULT_ASPECT_RATIO]
+
+
+def get_profile(tier: str, aspect_ratio: str = DEFAULT_ASPECT_RATIO) -> RenderProfile:
+    """Build the profile for 'preview' or 'final' at an aspect ratio from settings."""
+    width, height = rendition_size(aspect_ratio)
+
+    if tier == "preview":
+        return RenderProfile(
+            name="preview",
+            width=_even(width * settings.preview_scale),
+            height=_even(height * settings.preview_scale),
+            fps=settings.preview_fps,
+            preset=settings.preview_preset,
+            crf=settings.preview_crf,
+            aspect_ratio=aspect_ratio
+        )
+    if tier == "final":
+        return RenderProfile(
+            name="final",
+            width=width,
+            height=height,
+            fps=settings.video_fps,
+            preset=settings.final_preset,
+            crf=settings.final_crf,
+            aspect_ratio=aspect_ratio
+        )
+    raise ValueError(f"Unknown render tier: {tier}")
@@ -2,8 +2,11 @@
 Script Generator Service
 Uses Gemini API to generate product review scripts.
 """
+import os
+import asyncio
 import google.generativeai as genai
 from app.core.config import get_settings
+from app.services.disk_cache import DiskCache
 
 settings = get_settings()
 
@@ -11,25 +14,59 @@ settings = get_settings()
 class ScriptGenerator:
     """Generate product review scripts using LLM."""
     
+    # Bump when the prompt changes so cached scripts from the old prompt are not reused
+    PROMPT_VERSION = 1
+    
     def __init__(self):
         if settings.gemini_api_key:
             genai.configure(api_key=settings.gemini_api_key)
             self.model = genai.GenerativeModel('gemini-1.5-flash')
         else:
             self.model = None
+        
+        self.cache = DiskCache(
+            os.path.join(settings.cache_dir, "scripts"),
+            max_entries=settings.script_cache_max_entries,
+            ttl=settings.script_cache_ttl
+        )
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join((text or "").split()).casefold()
+    
+    def _cache_key(self, product_name: str, product_description: str, style: str) -> str:
+        return self.cache.key_for(
+            self._normalize(product_name),
+            self._normalize(product_description),
+            style,
+            self.PROMPT_VERSION
+        )
     
     async def generate_script(
         self, 
         product_name: str, 
         product_description: str,
-        style: str = "minimal"
+        style: str = "minimal",
+        bypass_cache: bool = False
     ) -> dict:
         """
         Generate a product review script.
         
+        Scripts generated by the LLM are cached on disk, so retries and
+        re-renders of the same product reuse them.
+        
+        Args:
+            bypass_cache: Skip the cache lookup to get a fresh variation
+        
         Returns:
             dict with 'hook', 'benefits', 'cta' sections
         """
+        cache_key = self._cache_key(product_name, product_description, style)
+        if self.model and not bypass_cache:
+            cached = await asyncio.to_thread(self.cache.get_json, cache_key)
+            if cached:
+                return cached
+        
         style_prompts = {
             "luxury": "mewah, eksklusif, dan premium",
             "minimal": "simpel, bersih, dan modern", 
@@ -62,7 +99,12 @@ Pastikan script terdengar natural untuk diucapkan dan cocok untuk video TikTok/R
         if self.model:
             try:
                 response = await self.model.generate_content_async(prompt)
-                return self._parse_script(response.text)
+                script = self._parse_script(response.text)
+                try:
+                    await asyncio.to_thread(self.cache.put_json, cache_key, script)
+                except OSError as e:
+                    print(f"Error caching script: {e}")
+                return script
             except Exception as e:
                 print(f"Error generating script: {e}")
                 return self._get_fallback_script(product_name)
@@ -0,0 +1,87 @@
+"""
+Stage Graph
+Runs pipeline stages as a dependency graph, starting each as soon as its inputs are ready.
+"""
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+StageFn = Callable[[dict], Awaitable[Any]]
+StageHook = Callable[[str], Optional[Awaitable[None]]]
+
+
+class StageGraph:
+    """
+    A small DAG scheduler for async stages.
+
+    Each stage is an async function that receives the results of the stages
+    finished so far (keyed by stage name). Independent stages run
+    concurrently; if any stage fails, the rest are cancelled and the error
+    is raised from `run()`.
+    """
+
+    def __init__(self):
+        self._stages: dict[str, tuple[StageFn, tuple[str, ...]]] = {}
+
+    @property
+    def stages(self) -> list[str]:
+        """Stage names in the order they were added."""
+        return list(self._stages)
+
+    def add(self, name: str, fn: StageFn, deps: Iterable[str] = ()) -> "StageGraph":
+        deps = tuple(deps)
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self._stages[name] = (fn, deps)
+        return self
+
+    async def run(
+        self,
+        on_start: Optional[StageHook] = None,
+        on_finish: Optional[StageHook] = None
+    ) -> dict:
+        """
+        Run every stage once its dependencies have finished.
+
+        Args:
+            on_start: Called with the stage name when a stage starts
+            on_finish: Called with the stage name when a stage finishes;
+                either hook may be a coroutine function, which is awaited
+
+        Returns:
+            dict of stage name -> result
+        """
+        results: dict[str, Any] = {}
+        running: dict[asyncio.Task, str] = {}
+        waiting = dict(self._stages)
+
+        async def call(hook: Optional[StageHook], name: str) -> None:
+            if hook is not None:
+                result = hook(name)
+                if inspect.isawaitable(result):
+                    await result
+
+        async def start_ready() -> None:
+            for name, (fn, deps) in list(waiting.items()):
+                if all(dep in results for dep in deps):
+                    del waiting[name]
+                    await call(on_start, name)
+                    running[asyncio.create_task(fn(results))] = name
+
+        try:
+            await start_ready()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    results[name] = task.result()
+                    await call(on_finish, name)
+                await start_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return results
@@ -0,0 +1,146 @@
+"""
+Status Stream Service
+Fans job progress events out to connected status stream clients.
+"""
+import json
+import asyncio
+from typing import Iterable, Optional
+import psycopg2
+from app.core.config import get_settings
+from app.core.database import engine
+from app.services.progress_bus import progress_bus, PROCESS_ID
+
+settings = get_settings()
+
+
+class StatusStream:
+    """
+    Delivers job events to subscribers without per-client database queries.
+
+    Events reach this process two ways: from the local progress bus (jobs
+    running in the same process) and, on Postgres, from one shared LISTEN
+    connection on `progress_channel` that carries events NOTIFYed by the
+    workers. Each subscriber gets a bounded queue of events for the videos
+    it follows.
+    """
+
+    QUEUE_SIZE = 256
+    RECONNECT_DELAY = 5.0
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._connection = None
+        self._reconnect: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        progress_bus.add_listener(self.publish)
+        if engine.dialect.name == "postgresql":
+            try:
+                self._listen()
+            except Exception as e:
+                print(f"Status stream LISTEN failed, retrying: {e}")
+                self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        progress_bus.remove_listener(self.publish)
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        self._close()
+
+    def subscribe(self, video_ids: Iterable[str]) -> asyncio.Queue:
+        """Register a queue that receives events for the given videos."""
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        for video_id in video_ids:
+            self._subscribers.setdefault(str(video_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, video_ids: Iterable[str]) -> None:
+        for video_id in video_ids:
+            queues = self._subscribers.get(str(video_id))
+            if queues is None:
+                continue
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[str(video_id)]
+
+    def publish(self, record: dict) -> None:
+        """Hand an event to everyone following its video."""
+        queues = self._subscribers.get(str(record["video_id"]))
+        if not queues:
+            return
+
+        event = {
+            "video_id": str(record["video_id"]),
+            "stage": record.get("stage"),
+            "event": record["event"],
+            "status": record.get("status"),
+            "progress": record.get("progress"),
+            "message": record.get("message"),
+            "fields": record.get("fields") or {}
+        }
+        for queue in queues:
+            if queue.full():
+                # A slow client only needs the latest state
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def _listen(self) -> None:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = psycopg2.connect(dsn)
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{settings.progress_channel}"')
+
+        self._connection = connection
+        self._loop.add_reader(connection.fileno(), self._on_notify)
+
+    def _on_notify(self) -> None:
+        try:
+            self._connection.poll()
+        except psycopg2.Error as e:
+            print(f"Status stream connection lost: {e}")
+            self._close()
+            self._schedule_reconnect()
+            return
+
+        while self._connection.notifies:
+            notify = self._connection.notifies.pop(0)
+            try:
+                record = json.loads(notify.payload)
+            except ValueError:
+                continue
+            # Events from this process were already delivered by the bus
+            if record.pop("origin", None) != PROCESS_ID:
+                self.publish(record)
+
+    def _close(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._loop.remove_reader(self._connection.fileno())
+        except (ValueError, psycopg2.Error):
+            pass
+        try:
+            self._connection.close()
+        except psycopg2.Error:
+            pass
+        self._connection = None
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect is None or self._reconnect.done():
+            self._reconnect = self._loop.create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        while self._connection is None:
+            await asyncio.sleep(self.RECONNECT_DELAY)
+            try:
+                self._listen()
+            except Exception as e:
+                print(f"Status stream LISTEN failed, retrying: {e}")
+
+
+# Singleton instance
+status_stream = StatusStream()
@@ -0,0 +1,84 @@
+"""
+Text Layout Service
+Process-wide font cache and memoized word-wrap for caption rendering.
+"""
+from functools import lru_cache
+from PIL import ImageFont
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Preferred fonts, tried in order
+FONT_PATHS = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+
+@lru_cache(maxsize=64)
+def load_truetype(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a TrueType font once per (path, size)."""
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=64)
+def get_font(size: int) -> ImageFont.ImageFont:
+    """Resolve the first available font at the given size, falling back to default."""
+    for path in FONT_PATHS:
+        try:
+            return load_truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=settings.text_layout_cache_size)
+def _word_width(font: ImageFont.ImageFont, word: str) -> float:
+    return font.getlength(word)
+
+
+@lru_cache(maxsize=settings.text_layout_cache_size)
+def layout_text(
+    text: str,
+    font: ImageFont.ImageFont,
+    max_width: int
+) -> tuple[tuple[str, int], ...]:
+    """
+    Word-wrap text to a maximum line width.
+
+    Each word is measured once and line widths are summed from the word
+    widths, so wrapping is linear in the number of words.
+
+    Returns:
+        Tuple of (line, width) pairs
+    """
+    space_width = _word_width(font, " ")
+
+    lines = []
+    current_line = []
+    current_width = 0.0
+
+    for word in text.split():
+        word_width = _word_width(font, word)
+        line_width = current_width + space_width + word_width if current_line else word_width
+
+        if line_width <= max_width:
+            current_line.append(word)
+            current_width = line_width
+        elif current_line:
+            lines.append((" ".join(current_line), round(current_width)))
+            current_line = [word]
+            current_width = word_width
+        else:
+            # A single word wider than the line gets a line of its own
+            lines.append((word, round(word_width)))
+
+        if current_line and current_width > max_width:
+            lines.append((" ".join(current_line), round(current_width)))
+            current_line = []
+            current_width = 0.0
+
+    if current_line:
+        lines.append((" ".join(current_line), round(current_width)))
+
+    return tuple(lines)
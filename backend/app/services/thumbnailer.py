@@ -0,0 +1,147 @@
+"""
+Thumbnailer Service
+Poster frames and thumbnails taken from rendered videos.
+"""
+import io
+import os
+from typing import Optional
+from PIL import Image, ImageStat
+from app.core.config import get_settings
+from app.services.disk_cache import DiskCache
+from app.services.media_encoder import media_encoder
+from app.services.render_pool import render_pool
+
+settings = get_settings()
+
+
+class Thumbnailer:
+    """
+    Picks a poster frame from a finished video and writes thumbnails of it.
+
+    Candidate frames are sampled from the start of the video in a single
+    ffmpeg decode pass and the most contrasty one (not a black or faded
+    frame) becomes the poster. The poster is kept at full size; the
+    configured widths are written next to it in WebP and JPEG, and any
+    other width is resized on demand into a size-bounded disk cache.
+    """
+
+    # format name -> (PIL format, file extension, media type)
+    FORMATS = {
+        "webp": ("WEBP", ".webp", "image/webp"),
+        "jpeg": ("JPEG", ".jpg", "image/jpeg"),
+    }
+
+    # On-demand widths are rounded to this step so the cache stays small
+    WIDTH_STEP = 20
+    MIN_WIDTH = 40
+
+    def __init__(self):
+        self.cache = DiskCache(
+            os.path.join(settings.cache_dir, "thumbnails"),
+            max_bytes=settings.thumbnail_cache_max_bytes
+        )
+
+    @staticmethod
+    def _poster_score(frame: Image.Image) -> float:
+        """Luma spread of a frame; black, blank and faded frames score low."""
+        small = frame.convert("L")
+        small.thumbnail((160, 160))
+        return ImageStat.Stat(small).stddev[0]
+
+    @staticmethod
+    def _resize(image: Image.Image, width: int) -> Image.Image:
+        height = max(1, round(image.height * width / image.width))
+        return image.resize((width, height), Image.Resampling.LANCZOS)
+
+    @classmethod
+    def _encode(cls, image: Image.Image, fmt: str) -> bytes:
+        pil_format = cls.FORMATS[fmt][0]
+        buffer = io.BytesIO()
+        image.save(buffer, pil_format, quality=settings.thumbnail_quality)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        # Replace atomically; the API may be serving the previous render's file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def thumbnail_path(cls, video_id: str, width: int, fmt: str) -> str:
+        """Where a pre-rendered thumbnail size of a video is written."""
+        return os.path.join(settings.output_dir, f"{video_id}_thumb_{width}{cls.FORMATS[fmt][1]}")
+
+    async def create_thumbnails(self, video_path: str, video_id: str) -> dict:
+        """Pick the poster and write the configured thumbnails in the render pool."""
+        return await render_pool.run(self.render_thumbnails, video_path, video_id)
+
+    @classmethod
+    def render_thumbnails(cls, video_path: str, video_id: str) -> dict:
+        """
+        Render the poster and thumbnails. Blocking; runs in the render pool.
+
+        A classmethod, so the pool does not pickle the instance and its cache.
+
+        Returns:
+            dict with 'poster_url' (full-size JPEG) and 'thumbnail_url'
+            (the default-width JPEG)
+        """
+        frames = media_encoder.extract_frames(
+            video_path,
+            settings.thumbnail_sample_frames,
+            settings.thumbnail_sample_window
+        )
+        if not frames:
+            raise RuntimeError(f"No frames decoded from {video_path}")
+        poster = max(frames, key=cls._poster_score)
+
+        poster_path = os.path.join(settings.output_dir, f"{video_id}_poster.jpg")
+        cls._write(poster_path, cls._encode(poster, "jpeg"))
+
+        # Never upscale; a low-res preview only gets the sizes it can fill
+        widths = sorted({min(width, poster.width) for width in settings.thumbnail_widths}, reverse=True)
+        for width in widths:
+            image = cls._resize(poster, width)
+            for fmt in cls.FORMATS:
+                cls._write(cls.thumbnail_path(video_id, width, fmt), cls._encode(image, fmt))
+
+        default_width = min(widths, key=lambda width: abs(width - settings.thumbnail_default_width))
+        return {
+            "poster_url": poster_path,
+            "thumbnail_url": cls.thumbnail_path(video_id, default_width, "jpeg")
+        }
+
+    def get_thumbnail(self, video_id: str, poster_path: str, width: Optional[int], fmt: str) -> str:
+        """
+        Path of a thumbnail at `width` px in `fmt`. Blocking.
+
+        Pre-rendered sizes are served as written; other widths are resized
+        from the poster once and kept in the thumbnail cache, keyed by the
+        poster's mtime so a re-render invalidates them.
+        """
+        with Image.open(poster_path) as poster:
+            poster_width = poster.width
+        width = width or settings.thumbnail_default_width
+        width = round(width / self.WIDTH_STEP) * self.WIDTH_STEP
+        width = min(max(width, self.MIN_WIDTH), poster_width)
+
+        if width in settings.thumbnail_widths or width == poster_width:
+            path = self.thumbnail_path(video_id, width, fmt)
+            if os.path.exists(path):
+                return path
+
+        suffix = self.FORMATS[fmt][1]
+        key = DiskCache.key_for(poster_path, os.path.getmtime(poster_path), width, fmt)
+        path = self.cache.get_path(key, suffix)
+        if path:
+            return path
+
+        with Image.open(poster_path) as poster:
+            data = self._encode(self._resize(poster.convert("RGB"), width), fmt)
+        return self.cache.put_bytes(key, data, suffix)
+
+
+# Singleton instance
+thumbnailer = Thumbnailer()
@@ -4,8 +4,10 @@ Uses Edge TTS (free Microsoft TTS) to generate voice overs.
 """
 import edge_tts
 import os
+import asyncio
 import uuid
 from app.core.config import get_settings
+from app.services.disk_cache import DiskCache
 
 settings = get_settings()
 
@@ -21,20 +23,33 @@ class TTSService:
     
     def __init__(self):
         os.makedirs(settings.output_dir, exist_ok=True)
+        
+        # Synthesized audio, stored by hash of (text, voice, rate, pitch)
+        self.store = DiskCache(
+            os.path.join(settings.cache_dir, "tts"),
+            max_bytes=settings.tts_cache_max_bytes
+        )
     
     async def generate_audio(
         self, 
         text: str, 
         voice: str = "female",
-        video_id: str = None
+        video_id: str = None,
+        rate: str = "+0%",
+        pitch: str = "+0Hz"
     ) -> str:
         """
         Generate audio from text.
         
+        Identical requests reuse previously synthesized audio from the store
+        instead of calling Edge TTS again.
+        
         Args:
             text: The text to convert to speech
             voice: 'male' or 'female'
             video_id: Optional video ID for filename
+            rate: Speaking rate adjustment, e.g. "+10%"
+            pitch: Pitch adjustment, e.g. "-5Hz"
             
         Returns:
             Path to the generated audio file
@@ -44,11 +59,35 @@ class TTSService:
         filename = f"{video_id or uuid.uuid4()}_audio.mp3"
         output_path = os.path.join(settings.output_dir, filename)
         
-        communicate = edge_tts.Communicate(text, voice_name)
-        await communicate.save(output_path)
+        key = self.store.key_for(text, voice_name, rate, pitch)
+        cached_path = await asyncio.to_thread(self.store.get_path, key, ".mp3")
+        if cached_path:
+            return await asyncio.to_thread(self.store.export, cached_path, output_path)
+        
+        # Synthesize into a new file: output_path may be a hard link to a
+        # cache entry of an earlier script, and writing it in place would
+        # change that entry too
+        tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            communicate = edge_tts.Communicate(text, voice_name, rate=rate, pitch=pitch)
+            await communicate.save(tmp_path)
+            
+            try:
+                await asyncio.to_thread(self.store.put_file, key, tmp_path, ".mp3")
+            except OSError as e:
+                print(f"Error caching audio: {e}")
+            
+            os.replace(tmp_path, output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
         
         return output_path
     
+    def cache_stats(self) -> dict:
+        """Hit-rate statistics for the audio store."""
+        return self.store.stats()
+    
     async def get_audio_duration(self, audio_path: str) -> float:
         """Get the duration of an audio file in seconds."""
         try:
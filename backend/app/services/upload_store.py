@@ -0,0 +1,235 @@
+"""
+Upload Store Service
+Streams uploaded product images to disk and stores them normalized, by content hash.
+"""
+import os
+import uuid
+import asyncio
+import hashlib
+import zipfile
+from typing import BinaryIO, Optional
+from fastapi import UploadFile
+from PIL import Image, ImageOps
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Marks a batch job's image that is still a member of the batch's staged archive
+ARCHIVE_PREFIX = "archive:"
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the per-file or per-request size limit."""
+
+
+class InvalidImageError(Exception):
+    """Raised when an upload is not a readable image."""
+
+
+class UploadStore:
+    """
+    Save uploads without buffering them in memory or blocking the event loop.
+
+    Each image is normalized once at ingest: EXIF orientation is applied and
+    it is downscaled to the largest size a layout uses, so render stages
+    decode a small, upright file. Normalized images are named by the SHA-256
+    of the uploaded bytes; uploading the same photo again reuses the stored
+    file instead of decoding and writing it a second time. Images of a
+    batch stay in its staged archive until the job that uses them runs.
+    """
+
+    def __init__(self):
+        os.makedirs(settings.upload_dir, exist_ok=True)
+
+    @staticmethod
+    def _max_side() -> int:
+        # Matches the bound VideoGenerator shrinks source images to
+        return min(settings.video_width, settings.video_height)
+
+    def find(self, sha256: str) -> Optional[str]:
+        """Path of an already normalized upload with this content hash."""
+        for ext in (".jpg", ".png"):
+            path = os.path.join(settings.upload_dir, f"{sha256}{ext}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def normalize(self, source_path: str, sha256: str) -> str:
+        """
+        Write the normalized copy of a raw upload. Blocking.
+
+        Opaque images are stored as JPEG; images with transparency keep it as PNG.
+
+        Returns:
+            Path to the normalized image
+        """
+        bound = self._max_side()
+        try:
+            with Image.open(source_path) as img:
+                # Let the JPEG decoder skip detail the downscale throws away anyway
+                img.draft("RGB", (bound, bound))
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+
+                has_alpha = img.mode in ("RGBA", "LA") or (
+                    img.mode == "P" and "transparency" in img.info
+                )
+                if has_alpha:
+                    img = img.convert("RGBA")
+                    ext, save_args = ".png", {"format": "PNG", "optimize": True}
+                else:
+                    img = img.convert("RGB")
+                    ext, save_args = ".jpg", {"format": "JPEG", "quality": settings.upload_jpeg_quality}
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise InvalidImageError(f"Not a readable image ({type(e).__name__})") from e
+
+        path = os.path.join(settings.upload_dir, f"{sha256}{ext}")
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            img.save(tmp_path, **save_args)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+    def _store_stream(self, src: BinaryIO, name: str, limit: int) -> dict:
+        """
+        Copy a byte stream to disk while hashing it, then store its
+        normalized copy unless one with the same hash exists. Blocking.
+
+        Args:
+            src: Readable binary stream with the image bytes
+            name: File name used in error messages
+            limit: Bytes allowed for this stream (at most max_upload_bytes)
+
+        Returns:
+            dict with 'path' (the normalized image), 'sha256' and 'size' of
+            the stored bytes, and 'created' (False when deduplicated)
+        """
+        part_path = os.path.join(settings.upload_dir, f"{uuid.uuid4()}.part")
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(part_path, "wb") as f:
+                while True:
+                    chunk = src.read(settings.upload_chunk_size)
+                    if not chunk:
+                        break
+
+                    size += len(chunk)
+                    if size > limit:
+                        if size > settings.max_upload_bytes:
+                            raise UploadTooLargeError(f"{name} exceeds {settings.max_upload_bytes} bytes")
+                        raise UploadTooLargeError(
+                            f"Uploads exceed {settings.max_request_upload_bytes} bytes per request"
+                        )
+
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            sha256 = digest.hexdigest()
+            filepath = self.find(sha256)
+            created = filepath is None
+            if created:
+                try:
+                    filepath = self.normalize(part_path, sha256)
+                except InvalidImageError as e:
+                    raise InvalidImageError(f"{name}: {e}") from e
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+        return {
+            "path": filepath,
+            "sha256": sha256,
+            "size": size,
+            "created": created
+        }
+
+    async def save(self, upload: UploadFile, request_budget: int) -> dict:
+        """
+        Store an uploaded image, off the event loop.
+
+        Args:
+            upload: The uploaded file
+            request_budget: Bytes still allowed for this request
+
+        Returns:
+            dict with 'path', 'sha256', 'size' and 'created', see _store_stream()
+        """
+        limit = min(settings.max_upload_bytes, request_budget)
+        return await asyncio.to_thread(self._store_stream, upload.file, upload.filename, limit)
+
+    def save_member(self, archive: zipfile.ZipFile, name: str) -> dict:
+        """
+        Store one image from a zip archive the way save() stores an upload. Blocking.
+
+        Sizes are counted as the member is inflated, not taken from its header.
+        """
+        with archive.open(name) as src:
+            return self._store_stream(src, name, settings.max_upload_bytes)
+
+    @staticmethod
+    def archive_path(batch_id) -> str:
+        """Where the image archive of a batch is kept until its jobs have stored their images."""
+        return os.path.join(settings.upload_dir, "batches", f"{batch_id}.zip")
+
+    def stage_archive(self, src: BinaryIO, batch_id) -> str:
+        """
+        Copy a batch's image archive to disk as uploaded. Blocking.
+
+        Members are only normalized when the job that uses them runs, so a
+        large catalog does not hold up the request that submits it.
+
+        Returns:
+            Path to the staged archive
+        """
+        path = self.archive_path(batch_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        src.seek(0)
+        size = 0
+        try:
+            with open(path, "wb") as f:
+                while True:
+                    chunk = src.read(settings.upload_chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > settings.batch_max_archive_bytes:
+                        raise UploadTooLargeError(
+                            f"Image archive exceeds {settings.batch_max_archive_bytes} bytes"
+                        )
+                    f.write(chunk)
+        except BaseException:
+            self.discard_archive(batch_id)
+            raise
+        return path
+
+    def store_archive_images(self, image_refs: list[str], batch_id) -> list[str]:
+        """
+        Store the archive members a job refers to and return its image paths. Blocking.
+
+        Args:
+            image_refs: Image paths, with archive members as ARCHIVE_PREFIX + member name
+
+        Returns:
+            The same list with every archive member replaced by its stored path
+        """
+        with zipfile.ZipFile(self.archive_path(batch_id)) as archive:
+            return [
+                self.save_member(archive, ref[len(ARCHIVE_PREFIX):])["path"]
+                if ref.startswith(ARCHIVE_PREFIX) else ref
+                for ref in image_refs
+            ]
+
+    def discard_archive(self, batch_id) -> None:
+        try:
+            os.remove(self.archive_path(batch_id))
+        except FileNotFoundError:
+            pass
+
+
+# Singleton instance
+upload_store = UploadStore()
@@ -3,12 +3,14 @@ Veo 3 Video Generator Service
 Uses Google Veo 3 API for AI video generation from images.
 """
 import os
-import time
-import base64
+import json
 import httpx
 import asyncio
 from pathlib import Path
+from typing import Optional
 from app.core.config import get_settings
+from app.services.veo_poller import OperationPoller
+from app.services.base64_stream import iter_base64_file, base64_length
 
 settings = get_settings()
 
@@ -16,11 +18,72 @@ settings = get_settings()
 class Veo3VideoGenerator:
     """Generate AI videos using Google Veo 3."""
     
-    BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+    MODEL = "veo-3.0-generate-preview"
+    
+    # Stands in for the image data in the JSON payload until it is streamed
+    IMAGE_PLACEHOLDER = "__IMAGE_BASE64__"
     
     def __init__(self):
         self.api_key = settings.gemini_api_key
+        self.base_url = settings.veo_base_url.rstrip("/")
         os.makedirs(settings.output_dir, exist_ok=True)
+        
+        # Process-wide cap on in-flight Veo operations, shared by all jobs
+        self.limiter = asyncio.Semaphore(settings.veo_max_concurrency)
+        
+        self._client: Optional[httpx.AsyncClient] = None
+        self.poller = OperationPoller(lambda: self.client)
+    
+    def _http2_enabled(self) -> bool:
+        if not settings.veo_http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("HTTP/2 requested for Veo 3 but the h2 package is not installed; using HTTP/1.1")
+            return False
+        return True
+    
+    async def startup(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """
+        Open the shared HTTP client. Called on app and worker startup.
+        
+        Args:
+            transport: Optional transport override, e.g. httpx.MockTransport in tests
+        """
+        if self._client is not None:
+            return
+        
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"x-goog-api-key": self.api_key},
+            timeout=httpx.Timeout(
+                connect=settings.veo_connect_timeout,
+                read=settings.veo_read_timeout,
+                write=settings.veo_read_timeout,
+                pool=settings.veo_pool_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.veo_max_connections,
+                max_keepalive_connections=settings.veo_max_connections,
+                keepalive_expiry=settings.veo_keepalive_expiry
+            ),
+            http2=self._http2_enabled(),
+            transport=transport
+        )
+    
+    async def shutdown(self) -> None:
+        """Close the shared HTTP client. Called on app and worker shutdown."""
+        await self.poller.stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("Veo 3 client not started; call startup() first")
+        return self._client
     
     async def generate_video_from_image(
         self,
@@ -46,10 +109,6 @@ class Veo3VideoGenerator:
         if not self.api_key:
             raise ValueError("Gemini API key not configured")
         
-        # Read and encode image
-        with open(image_path, "rb") as f:
-            image_data = base64.standard_b64encode(f.read()).decode("utf-8")
-        
         # Determine mime type
         ext = Path(image_path).suffix.lower()
         mime_types = {
@@ -60,57 +119,18 @@ class Veo3VideoGenerator:
         }
         mime_type = mime_types.get(ext, "image/jpeg")
         
-        # Create generation request
-        url = f"{self.BASE_URL}/models/veo-3.0-generate-preview:predictLongRunning"
-        
-        payload = {
-            "instances": [
-                {
-                    "prompt": prompt,
-                    "image": {
-                        "bytesBase64Encoded": image_data,
-                        "mimeType": mime_type
-                    }
-                }
-            ],
-            "parameters": {
-                "aspectRatio": aspect_ratio,
-                "durationSeconds": duration_seconds,
-                "personGeneration": "dont_allow",
-                "numberOfVideos": 1
+        # The image is base64-encoded while the request body streams out
+        instance = {
+            "prompt": prompt,
+            "image": {
+                "bytesBase64Encoded": self.IMAGE_PLACEHOLDER,
+                "mimeType": mime_type
             }
         }
         
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": self.api_key
-        }
-        
-        async with httpx.AsyncClient(timeout=300) as client:
-            # Start generation
-            response = await client.post(url, json=payload, headers=headers)
-            
-            if response.status_code != 200:
-                error_detail = response.json() if response.content else response.text
-                raise Exception(f"Veo 3 API error: {response.status_code} - {error_detail}")
-            
-            result = response.json()
-            operation_name = result.get("name")
-            
-            if not operation_name:
-                raise Exception("No operation name returned from Veo 3")
-            
-            # Poll for completion
-            video_data = await self._poll_operation(client, operation_name, headers)
-            
-            # Save video
-            output_path = os.path.join(settings.output_dir, f"{video_id}_veo.mp4")
-            video_bytes = base64.standard_b64decode(video_data)
-            
-            with open(output_path, "wb") as f:
-                f.write(video_bytes)
-            
-            return output_path
+        return await self._generate(
+            instance, video_id, aspect_ratio, duration_seconds, image_path=image_path
+        )
     
     async def generate_video_from_text(
         self,
@@ -134,14 +154,50 @@ class Veo3VideoGenerator:
         if not self.api_key:
             raise ValueError("Gemini API key not configured")
         
-        url = f"{self.BASE_URL}/models/veo-3.0-generate-preview:predictLongRunning"
+        instance = {
+            "prompt": prompt
+        }
         
+        return await self._generate(instance, video_id, aspect_ratio, duration_seconds)
+    
+    def _request_body(self, payload: dict, image_path: Optional[str]) -> tuple[dict, object]:
+        """
+        Build the request body, streaming the source image as base64.
+        
+        Returns:
+            (headers, content) for the POST request
+        """
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        
+        if not image_path:
+            return headers, body
+        
+        prefix, suffix = body.split(json.dumps(self.IMAGE_PLACEHOLDER).encode("utf-8"), 1)
+        prefix += b'"'
+        suffix = b'"' + suffix
+        
+        async def stream():
+            yield prefix
+            async for chunk in iter_base64_file(image_path):
+                yield chunk
+            yield suffix
+        
+        size = len(prefix) + base64_length(os.path.getsize(image_path)) + len(suffix)
+        headers["Content-Length"] = str(size)
+        return headers, stream()
+    
+    async def _generate(
+        self,
+        instance: dict,
+        video_id: str,
+        aspect_ratio: str,
+        duration_seconds: int,
+        image_path: Optional[str] = None
+    ) -> str:
+        """Submit a generation request, wait for it and save the video."""
         payload = {
-            "instances": [
-                {
-                    "prompt": prompt
-                }
-            ],
+            "instances": [instance],
             "parameters": {
                 "aspectRatio": aspect_ratio,
                 "durationSeconds": duration_seconds,
@@ -150,13 +206,18 @@ class Veo3VideoGenerator:
             }
         }
         
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": self.api_key
-        }
+        output_path = os.path.join(settings.output_dir, f"{video_id}_veo.mp4")
+        if os.path.exists(output_path):
+            os.remove(output_path)
         
-        async with httpx.AsyncClient(timeout=300) as client:
-            response = await client.post(url, json=payload, headers=headers)
+        async with self.limiter:
+            # Start generation
+            headers, content = self._request_body(payload, image_path)
+            response = await self.client.post(
+                f"/models/{self.MODEL}:predictLongRunning",
+                content=content,
+                headers=headers
+            )
             
             if response.status_code != 200:
                 error_detail = response.json() if response.content else response.text
@@ -168,60 +229,23 @@ class Veo3VideoGenerator:
             if not operation_name:
                 raise Exception("No operation name returned from Veo 3")
             
-            video_data = await self._poll_operation(client, operation_name, headers)
-            
-            output_path = os.path.join(settings.output_dir, f"{video_id}_veo.mp4")
-            video_bytes = base64.standard_b64decode(video_data)
-            
-            with open(output_path, "wb") as f:
-                f.write(video_bytes)
-            
-            return output_path
+            # Poll for completion; the video is decoded straight to output_path
+            await self._poll_operation(operation_name, output_path)
+        
+        return output_path
     
-    async def _poll_operation(
-        self, 
-        client: httpx.AsyncClient, 
-        operation_name: str, 
-        headers: dict,
-        max_wait: int = 300
-    ) -> str:
-        """Poll long-running operation until complete."""
-        url = f"{self.BASE_URL}/{operation_name}"
+    async def _poll_operation(self, operation_name: str, output_path: str) -> None:
+        """Wait for a long-running operation via the shared poller."""
+        result = await self.poller.wait(operation_name, output_path)
         
-        start_time = time.time()
+        response_data = result.get("response", {})
+        generated_videos = response_data.get("generatedVideos", [])
         
-        while True:
-            if time.time() - start_time > max_wait:
-                raise TimeoutError("Veo 3 video generation timed out")
-            
-            response = await client.get(url, headers=headers)
-            
-            if response.status_code != 200:
-                raise Exception(f"Failed to poll operation: {response.status_code}")
-            
-            result = response.json()
-            
-            if result.get("done"):
-                # Check for error
-                if "error" in result:
-                    raise Exception(f"Veo 3 generation failed: {result['error']}")
-                
-                # Extract video data
-                response_data = result.get("response", {})
-                generated_videos = response_data.get("generatedVideos", [])
-                
-                if not generated_videos:
-                    raise Exception("No videos generated")
-                
-                video_data = generated_videos[0].get("video", {}).get("bytesBase64Encoded")
-                
-                if not video_data:
-                    raise Exception("No video data in response")
-                
-                return video_data
-            
-            # Wait before next poll
-            await asyncio.sleep(5)
+        if not generated_videos:
+            raise Exception("No videos generated")
+        
+        if not os.path.exists(output_path):
+            raise Exception("No video data in response")
     
     def build_product_video_prompt(
         self,
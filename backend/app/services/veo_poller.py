@@ -0,0 +1,314 @@
+"""
+Veo Operation Poller
+Single background poller for all outstanding Veo 3 long-running operations.
+"""
+import os
+import json
+import time
+import random
+import asyncio
+import statistics
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+import httpx
+from app.core.config import get_settings
+from app.services.base64_stream import Base64FieldExtractor
+
+settings = get_settings()
+
+
+@dataclass
+class _Operation:
+    name: str
+    output_path: str
+    future: asyncio.Future
+    submitted_at: float
+    deadline: float
+    next_poll_at: float
+    polls: int = 0
+    overdue_polls: int = 0
+    retries: int = 0  # consecutive transient poll failures
+
+
+class _LazyFile:
+    """File sink that is only created once something is written to it."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def write(self, data: bytes) -> None:
+        if self._file is None:
+            self._file = open(self.path, "wb")
+        self._file.write(data)
+
+    def close(self) -> bool:
+        """Close the file; returns True if anything was written."""
+        if self._file is None:
+            return False
+        self._file.close()
+        return True
+
+
+class _TransientPollError(Exception):
+    """A poll failed in a way that is worth retrying (network error, 429, 5xx)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OperationPoller:
+    """
+    Tracks every in-flight Veo operation across jobs and schedules their polls from one task.
+
+    Instead of a fixed 5 s loop per clip, each operation is first polled
+    shortly before operations usually finish (based on the observed
+    completion times), then with jittered exponential backoff. Callers await
+    a future that resolves with the finished operation.
+
+    Each poll runs as its own task, so a slow response or a large finished
+    clip never holds up other operations, deadline checks or newly
+    registered operations; an operation is never polled twice at once.
+    Network errors, 429 and 5xx responses are retried with backoff until
+    the operation's deadline; only a terminal error fails the clip.
+
+    Response bodies are streamed: the base64 video in a finished operation
+    is decoded chunk by chunk straight into the caller's output file.
+    """
+
+    def __init__(self, get_client: Callable[[], httpx.AsyncClient]):
+        self._get_client = get_client
+        self._operations: dict[str, _Operation] = {}
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._completion_times: deque[float] = deque(maxlen=200)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+
+    async def wait(
+        self,
+        operation_name: str,
+        output_path: str,
+        timeout: Optional[float] = None
+    ) -> dict:
+        """
+        Register an operation and wait until it is done.
+
+        Args:
+            operation_name: Name returned by predictLongRunning
+            output_path: Where the generated video is written
+            timeout: Seconds to wait (defaults to settings.veo_operation_timeout)
+
+        Returns:
+            The final operation resource, with the video data removed
+        """
+        self._ensure_running()
+
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        operation = _Operation(
+            name=operation_name,
+            output_path=output_path,
+            future=loop.create_future(),
+            submitted_at=now,
+            deadline=now + (timeout or settings.veo_operation_timeout),
+            next_poll_at=now + self._first_delay()
+        )
+        self._operations[operation_name] = operation
+        self._wakeup.set()
+
+        try:
+            return await operation.future
+        finally:
+            self._operations.pop(operation_name, None)
+
+    async def stop(self) -> None:
+        """Stop the background task and fail anything still waiting."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        for task in self._in_flight.values():
+            task.cancel()
+        await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        self._in_flight.clear()
+
+        for operation in list(self._operations.values()):
+            if not operation.future.done():
+                operation.future.set_exception(RuntimeError("Veo 3 poller stopped"))
+        self._operations.clear()
+
+    def stats(self) -> dict:
+        return {
+            "outstanding": len(self._operations),
+            "in_flight": len(self._in_flight),
+            "polls": self.polls,
+            "completed": len(self._completion_times),
+            "median_completion": self._quantile(0.5),
+        }
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def _quantile(self, q: float) -> Optional[float]:
+        if len(self._completion_times) < 5:
+            return None
+        cuts = statistics.quantiles(self._completion_times, n=20)
+        return cuts[min(int(q * 20), len(cuts) - 1)]
+
+    def _jitter(self, delay: float) -> float:
+        spread = settings.veo_poll_jitter
+        return delay * random.uniform(1 - spread, 1 + spread)
+
+    def _first_delay(self) -> float:
+        """Hold off the first poll until operations usually start finishing."""
+        early = self._quantile(0.1)
+        if early is None:
+            return settings.veo_poll_min_interval
+        return max(settings.veo_poll_min_interval, self._jitter(early * 0.9))
+
+    def _next_delay(self, operation: _Operation, now: float) -> float:
+        elapsed = now - operation.submitted_at
+        expected = self._quantile(0.5)
+
+        if expected is not None and elapsed < expected:
+            # Close in on the typical completion time
+            delay = (expected - elapsed) / 2
+        else:
+            operation.overdue_polls += 1
+            delay = settings.veo_poll_min_interval * (1.5 ** operation.overdue_polls)
+
+        delay = min(max(delay, settings.veo_poll_min_interval), settings.veo_poll_max_interval)
+        return self._jitter(delay)
+
+    def _retry_delay(self, operation: _Operation, retry_after: Optional[float]) -> float:
+        """Backoff after a transient failure, honouring Retry-After when given."""
+        operation.retries += 1
+        delay = min(
+            settings.veo_poll_min_interval * (2 ** (operation.retries - 1)),
+            settings.veo_poll_max_interval
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return self._jitter(delay)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        try:
+            return float(response.headers["retry-after"])
+        except (KeyError, ValueError):
+            return None
+
+    async def _poll(self, operation: _Operation) -> None:
+        self.polls += 1
+        operation.polls += 1
+
+        part_path = f"{operation.output_path}.part"
+        sink = _LazyFile(part_path)
+
+        try:
+            async with self._get_client().stream("GET", f"/{operation.name}") as response:
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise _TransientPollError(
+                        f"Operation poll returned {response.status_code}",
+                        self._retry_after(response)
+                    )
+                if response.status_code != 200:
+                    raise Exception(f"Failed to poll operation: {response.status_code}")
+
+                extractor = Base64FieldExtractor(sink)
+                async for chunk in response.aiter_bytes(settings.veo_stream_chunk_size):
+                    extractor.feed(chunk)
+
+            written = sink.close()
+            result = json.loads(extractor.envelope())
+
+            if written and result.get("done") and "error" not in result:
+                os.replace(part_path, operation.output_path)
+        except (_TransientPollError, httpx.TransportError) as e:
+            # Try again later; the deadline check gives up eventually
+            retry_after = e.retry_after if isinstance(e, _TransientPollError) else None
+            print(f"Veo 3 poll of {operation.name} failed, retrying: {e}")
+            now = time.monotonic()
+            operation.next_poll_at = now + self._retry_delay(operation, retry_after)
+            return
+        except Exception as e:
+            if not operation.future.done():
+                operation.future.set_exception(e)
+            return
+        finally:
+            sink.close()
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+        now = time.monotonic()
+        operation.retries = 0
+
+        if result.get("done"):
+            self._completion_times.append(now - operation.submitted_at)
+            if operation.future.done():
+                return
+            if "error" in result:
+                operation.future.set_exception(
+                    Exception(f"Veo 3 generation failed: {result['error']}")
+                )
+            else:
+                operation.future.set_result(result)
+            return
+
+        operation.next_poll_at = now + self._next_delay(operation, now)
+
+    def _start_poll(self, operation: _Operation) -> None:
+        task = asyncio.create_task(self._poll(operation))
+        self._in_flight[operation.name] = task
+
+        def done(_task: asyncio.Task) -> None:
+            if self._in_flight.get(operation.name) is _task:
+                del self._in_flight[operation.name]
+            # Reschedule: the operation has a new next_poll_at or is finished
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+        task.add_done_callback(done)
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+
+            for operation in list(self._operations.values()):
+                if operation.future.done():
+                    continue
+                if now > operation.deadline:
+                    operation.future.set_exception(
+                        TimeoutError("Veo 3 video generation timed out")
+                    )
+                    task = self._in_flight.get(operation.name)
+                    if task is not None:
+                        task.cancel()
+
+            pending = [
+                operation for operation in self._operations.values()
+                if not operation.future.done()
+            ]
+            for operation in pending:
+                if operation.name not in self._in_flight and operation.next_poll_at <= now:
+                    self._start_poll(operation)
+
+            # Sleep until the next poll is due, a deadline passes, a poll
+            # finishes or a new operation is registered
+            wake_times = [operation.deadline for operation in pending] + [
+                operation.next_poll_at for operation in pending
+                if operation.name not in self._in_flight
+            ]
+            sleep_for = max(min(wake_times) - time.monotonic(), 0) if wake_times else None
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
@@ -3,8 +3,9 @@ Video Generator Service
 Creates product review videos using MoviePy and PIL.
 """
 import os
-import uuid
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from typing import Optional
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
 from moviepy import (
     ImageClip, 
     AudioFileClip, 
@@ -13,6 +14,11 @@ from moviepy import (
     concatenate_videoclips
 )
 from app.core.config import get_settings
+from app.services.media_encoder import media_encoder
+from app.services.text_layout import get_font, layout_text
+from app.services.asset_cache import asset_cache
+from app.services.render_pool import render_pool
+from app.services.render_profiles import RenderProfile, get_profile
 
 settings = get_settings()
 
@@ -57,10 +63,31 @@ class VideoGenerator:
         image_paths: list[str],
         audio_path: str,
         script_sections: dict,
-        style: str = "minimal"
+        style: str = "minimal",
+        profile: Optional[RenderProfile] = None
+    ) -> str:
+        """Generate a product review video in the render pool."""
+        return await render_pool.run(
+            self.render_video,
+            video_id,
+            image_paths,
+            audio_path,
+            script_sections,
+            style,
+            profile
+        )
+    
+    def render_video(
+        self,
+        video_id: str,
+        image_paths: list[str],
+        audio_path: str,
+        script_sections: dict,
+        style: str = "minimal",
+        profile: Optional[RenderProfile] = None
     ) -> str:
         """
-        Generate a product review video.
+        Render a product review video. Blocking; runs in the render pool.
         
         Args:
             video_id: Unique ID for the video
@@ -68,11 +95,13 @@ class VideoGenerator:
             audio_path: Path to the audio file
             script_sections: Dict with 'hook', 'benefits', 'cta' text
             style: Video style
+            profile: Render tier (defaults to the final profile)
             
         Returns:
             Path to the generated video file
         """
         config = self.STYLE_CONFIGS.get(style, self.STYLE_CONFIGS["minimal"])
+        profile = profile or get_profile("final")
         
         # Get audio duration
         audio_clip = AudioFileClip(audio_path)
@@ -82,27 +111,47 @@ class VideoGenerator:
         num_scenes = min(len(image_paths), 3) if image_paths else 1
         scene_duration = total_duration / num_scenes
         
-        clips = []
         texts = [script_sections.get("hook", ""), 
                  script_sections.get("benefits", ""),
                  script_sections.get("cta", "")]
         
+        frames = []
         for i in range(num_scenes):
-            # Create scene
+            # Render scene frame
             if image_paths and i < len(image_paths):
-                scene = self._create_product_scene(
+                frame = self._render_product_frame(
                     image_paths[i], 
                     texts[i] if i < len(texts) else "",
                     config,
-                    scene_duration
+                    profile
                 )
             else:
-                scene = self._create_text_scene(
+                frame = self._render_text_frame(
                     texts[i] if i < len(texts) else "Product Review",
                     config,
-                    scene_duration
+                    profile
                 )
-            clips.append(scene)
+            frames.append(frame)
+        
+        output_path = os.path.join(settings.output_dir, f"{video_id}.mp4")
+        
+        if settings.still_fast_path:
+            # Scenes are static: send each frame to the encoder once
+            audio_clip.close()
+            return media_encoder.encode_stills(
+                frames,
+                [scene_duration] * num_scenes,
+                output_path,
+                audio_path=audio_path,
+                fps=profile.fps,
+                preset=profile.preset,
+                crf=profile.crf
+            )
+        
+        clips = [
+            ImageClip(np.asarray(frame)).with_duration(scene_duration)
+            for frame in frames
+        ]
         
         # Concatenate all clips
         final_video = concatenate_videoclips(clips, method="compose")
@@ -111,14 +160,14 @@ class VideoGenerator:
         final_video = final_video.with_audio(audio_clip)
         
         # Export
-        output_path = os.path.join(settings.output_dir, f"{video_id}.mp4")
         final_video.write_videofile(
             output_path,
-            fps=settings.video_fps,
+            fps=profile.fps,
             codec="libx264",
             audio_codec="aac",
             threads=4,
-            preset="medium"
+            preset=profile.preset,
+            ffmpeg_params=[*media_encoder.FASTSTART, "-crf", str(profile.crf)]
         )
         
         # Cleanup
@@ -129,31 +178,34 @@ class VideoGenerator:
         
         return output_path
     
-    def _create_product_scene(
+    def _render_product_frame(
         self, 
         image_path: str, 
         text: str, 
         config: dict,
-        duration: float
-    ) -> ImageClip:
-        """Create a scene with product image and text overlay."""
-        # Create background
-        bg = Image.new('RGB', (settings.video_width, settings.video_height), config["bg_color"])
+        profile: RenderProfile
+    ) -> Image.Image:
+        """Render the still frame for a product scene."""
+        width, height, s = profile.width, profile.height, profile.scale
+        
+        # Start from a copy of the cached background
+        bg = self._base_layer(config, width, height)
         
         # Load and resize product image
         try:
-            product_img = Image.open(image_path)
+            product_img = self._source_image(image_path)
             # Calculate size to fit in frame with padding
-            max_size = min(settings.video_width - 100, settings.video_height - 400)
+            max_size = min(width - int(100 * s), height - int(400 * s))
             product_img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
             
             # Center product image
-            x = (settings.video_width - product_img.width) // 2
-            y = (settings.video_height - product_img.height) // 2 - 100
+            x = (width - product_img.width) // 2
+            y = (height - product_img.height) // 2 - int(100 * s)
             
             # Add shadow effect
-            shadow = Image.new('RGBA', product_img.size, (0, 0, 0, 100))
-            bg.paste(shadow, (x + 10, y + 10), shadow if shadow.mode == 'RGBA' else None)
+            shadow_mask = self._shadow_mask(product_img.size)
+            offset = max(1, int(10 * s))
+            bg.paste((0, 0, 0), (x + offset, y + offset), shadow_mask)
             
             # Paste product image
             if product_img.mode == 'RGBA':
@@ -165,125 +217,99 @@ class VideoGenerator:
         
         # Add text at bottom
         if text:
-            bg = self._add_text_overlay(bg, text, config, position="bottom")
-        
-        # Convert to clip
-        bg_path = os.path.join(settings.output_dir, f"temp_{uuid.uuid4()}.png")
-        bg.save(bg_path)
-        
-        clip = ImageClip(bg_path).with_duration(duration)
+            bg = self._add_text_overlay(bg, text, config, profile, position="bottom")
         
-        # Cleanup temp file
-        try:
-            os.remove(bg_path)
-        except:
-            pass
-        
-        return clip
+        return bg
     
-    def _create_text_scene(
-        self, 
-        text: str, 
-        config: dict,
-        duration: float
-    ) -> ImageClip:
-        """Create a scene with text only."""
-        bg = Image.new('RGB', (settings.video_width, settings.video_height), config["bg_color"])
+    def _render_text_frame(self, text: str, config: dict, profile: RenderProfile) -> Image.Image:
+        """Render the still frame for a text-only scene."""
+        bg = self._base_layer(config, profile.width, profile.height)
         
         if text:
-            bg = self._add_text_overlay(bg, text, config, position="center")
+            bg = self._add_text_overlay(bg, text, config, profile, position="center")
         
-        bg_path = os.path.join(settings.output_dir, f"temp_{uuid.uuid4()}.png")
-        bg.save(bg_path)
+        return bg
+    
+    def _source_image(self, image_path: str) -> Image.Image:
+        """
+        Return a copy of a decoded product image.
         
-        clip = ImageClip(bg_path).with_duration(duration)
+        Each image is decoded at most once per render pool process and shrunk
+        to the largest size any layout pastes it at. Renditions of one job
+        may run in different pool processes, and each of those decodes the
+        image on its own; uploads are stored at this size already, so that
+        decode is small.
+        """
+        bound = min(settings.video_width, settings.video_height)
         
-        try:
-            os.remove(bg_path)
-        except:
-            pass
+        def load() -> Image.Image:
+            img = Image.open(image_path)
+            img.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+            img.load()
+            return img
         
-        return clip
+        source = asset_cache.get_or_create(
+            ("source", image_path, os.path.getmtime(image_path), bound),
+            load
+        )
+        return source.copy()
+    
+    def _base_layer(self, config: dict, width: int, height: int) -> Image.Image:
+        """Return a fresh copy of the cached solid background for a style."""
+        base = asset_cache.get_or_create(
+            ("base", config["bg_color"], width, height),
+            lambda: Image.new('RGB', (width, height), config["bg_color"])
+        )
+        return base.copy()
+    
+    def _shadow_mask(self, size: tuple[int, int], alpha: int = 100) -> Image.Image:
+        """Return the cached drop-shadow mask for a product image size."""
+        return asset_cache.get_or_create(
+            ("shadow_mask", size, alpha),
+            lambda: Image.new('L', size, alpha)
+        )
     
     def _add_text_overlay(
         self, 
         image: Image.Image, 
         text: str, 
         config: dict,
+        profile: RenderProfile,
         position: str = "bottom"
     ) -> Image.Image:
         """Add text overlay to image."""
         draw = ImageDraw.Draw(image)
+        width, height, s = profile.width, profile.height, profile.scale
         
-        # Try to use a nice font, fallback to default
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", config["font_size"])
-        except:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", config["font_size"])
-            except:
-                font = ImageFont.load_default()
-        
-        # Word wrap text
-        words = text.split()
-        lines = []
-        current_line = []
-        max_width = settings.video_width - 100
-        
-        for word in words:
-            current_line.append(word)
-            test_line = ' '.join(current_line)
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] > max_width:
-                if len(current_line) > 1:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    lines.append(test_line)
-                    current_line = []
-        
-        if current_line:
-            lines.append(' '.join(current_line))
+        # Layout is designed for the full resolution; scale it for smaller tiers
+        font_size = max(1, round(config["font_size"] * s))
+        font = get_font(font_size)
+        lines = layout_text(text, font, width - int(100 * s))
         
         # Calculate text position
-        line_height = config["font_size"] + 10
+        line_height = font_size + int(10 * s)
         total_text_height = len(lines) * line_height
         
         if position == "bottom":
-            y_start = settings.video_height - total_text_height - 150
+            y_start = height - total_text_height - int(150 * s)
         elif position == "top":
-            y_start = 100
+            y_start = int(100 * s)
         else:  # center
-            y_start = (settings.video_height - total_text_height) // 2
+            y_start = (height - total_text_height) // 2
+        
+        shadow = max(1, int(2 * s))
         
         # Draw text with shadow
-        for i, line in enumerate(lines):
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = (settings.video_width - text_width) // 2
+        for i, (line, text_width) in enumerate(lines):
+            x = (width - text_width) // 2
             y = y_start + i * line_height
             
             # Shadow
-            draw.text((x + 2, y + 2), line, font=font, fill=(0, 0, 0))
+            draw.text((x + shadow, y + shadow), line, font=font, fill=(0, 0, 0))
             # Main text
             draw.text((x, y), line, font=font, fill=config["text_color"])
         
         return image
-    
-    async def create_thumbnail(self, image_path: str, video_id: str) -> str:
-        """Create a thumbnail from the first product image."""
-        try:
-            img = Image.open(image_path)
-            img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-            
-            thumb_path = os.path.join(settings.output_dir, f"{video_id}_thumb.jpg")
-            img.save(thumb_path, "JPEG", quality=85)
-            
-            return thumb_path
-        except Exception as e:
-            print(f"Error creating thumbnail: {e}")
-            return ""
 
 
 # Singleton instance
@@ -0,0 +1,460 @@
+"""
+Video Pipeline
+Runs a single video generation job: script, voice over, Veo 3 clips and finishing.
+"""
+import os
+import json
+import uuid
+import asyncio
+
+from app.core.config import get_settings
+from app.core.database import session_scope
+from app.models.video import Video, VideoStatus
+from app.services.script_generator import script_generator
+from app.services.tts_service import tts_service
+from app.services.video_generator import video_generator
+from app.services.thumbnailer import thumbnailer
+from app.services.media_encoder import media_encoder
+from app.services.render_pool import render_pool
+from app.services.render_profiles import DEFAULT_ASPECT_RATIO, VEO_ASPECT_RATIOS, get_profile
+from app.services.progress_bus import progress_bus
+from app.services.stage_graph import StageGraph
+from app.services.upload_store import upload_store, ARCHIVE_PREFIX
+
+settings = get_settings()
+
+
+# Pipeline stages in reporting order, with the status shown while each is unfinished
+STAGE_STATUS = {
+    "script": VideoStatus.GENERATING_SCRIPT.value,
+    "audio": VideoStatus.GENERATING_AUDIO.value,
+    "preview": VideoStatus.GENERATING_VIDEO.value,
+    "veo": VideoStatus.GENERATING_VIDEO.value,
+    "clips": VideoStatus.GENERATING_VIDEO.value,
+    "finish": VideoStatus.GENERATING_VIDEO.value,
+    "thumbnail": VideoStatus.GENERATING_VIDEO.value,
+}
+
+# Stages that can run after the preview; they report PREVIEW_READY once it exists
+FINAL_STAGES = ("veo", "clips", "finish", "thumbnail")
+
+# Relative share of overall progress each stage accounts for
+STAGE_WEIGHT = {
+    "script": 10,
+    "audio": 10,
+    "preview": 10,
+    "veo": 45,
+    "clips": 10,
+    "finish": 12,
+    "thumbnail": 3,
+}
+
+# Row fields status stream clients show; sent with the event that writes them
+STREAM_FIELDS = ("video_url", "preview_url", "error_message")
+
+
+def _stream_fields(fields: dict) -> dict:
+    return {name: fields[name] for name in STREAM_FIELDS if name in fields}
+
+
+def _requested_aspects(video: Video) -> list[str]:
+    """Aspect ratios the job renders, primary first."""
+    if not video.renditions:
+        return [DEFAULT_ASPECT_RATIO]
+    return [rendition["aspect_ratio"] for rendition in json.loads(video.renditions)]
+
+
+def _rendition_suffix(aspect_ratio: str, primary: str) -> str:
+    """File name suffix of a rendition; the primary keeps the plain name."""
+    return "" if aspect_ratio == primary else "_" + aspect_ratio.replace(":", "x")
+
+
+def _load_video(video_id: uuid.UUID):
+    """Load a detached snapshot of the job's video row. Blocking."""
+    with session_scope() as db:
+        video = db.query(Video).filter(Video.id == video_id).first()
+        if video:
+            db.expunge(video)
+        return video
+
+
+def _update_video(video_id: uuid.UUID, **fields) -> None:
+    """Write job checkpoints in their own short transaction. Blocking."""
+    with session_scope() as db:
+        db.query(Video).filter(Video.id == video_id).update(
+            {getattr(Video, name): value for name, value in fields.items()},
+            synchronize_session=False
+        )
+
+
+def _store_batch_images(video_id: uuid.UUID, batch_id: uuid.UUID, image_refs: list[str]) -> list[str]:
+    """
+    Normalize the archive members a batch job uses and save their paths.
+    Blocking. The staged archive is removed once no job of the batch
+    refers to it any more.
+    """
+    image_paths = upload_store.store_archive_images(image_refs, batch_id)
+    _update_video(video_id, image_paths=json.dumps(image_paths))
+
+    with session_scope() as db:
+        still_needed = db.query(Video.id).filter(
+            Video.batch_id == batch_id,
+            Video.image_paths.like(f'%"{ARCHIVE_PREFIX}%')
+        ).first()
+    if not still_needed:
+        upload_store.discard_archive(batch_id)
+    return image_paths
+
+
+async def process_video_generation(video_id: str):
+    """
+    Process a claimed video generation job with Veo 3 AI.
+    
+    The job runs as a stage graph: Veo generation only needs the product
+    details, so it starts right away alongside the script; the voice over
+    follows the script, and Veo fallbacks and finishing wait for both.
+    
+    A low-res slideshow preview is rendered as soon as the voice over is
+    ready, so the merchant can watch something within seconds. The final
+    tier runs in the same job, or only after /finalize when
+    settings.final_render is "on_demand".
+    
+    A job can ask for several aspect ratios. Script, voice over and Veo
+    clips are shared; only fallback layouts and the finishing encode run
+    per rendition, in parallel.
+    
+    Stage start/finish events go to the progress bus; the video row is only
+    written at checkpoints (status changes and stage outputs).
+    """
+    from app.services.veo3_generator import veo3_generator
+    
+    video_id = uuid.UUID(str(video_id))
+    video = None
+    checkpoint = {}  # row fields saved with the next checkpoint write
+    
+    try:
+        video = await asyncio.to_thread(_load_video, video_id)
+        if not video:
+            return
+        
+        image_paths = json.loads(video.image_paths) if video.image_paths else []
+        if any(path.startswith(ARCHIVE_PREFIX) for path in image_paths):
+            image_paths = await asyncio.to_thread(
+                _store_batch_images, video_id, video.batch_id, image_paths
+            )
+        aspects = _requested_aspects(video)
+        primary = aspects[0]
+        # Veo renders once, in the primary ratio if it can; other renditions are letterboxed
+        veo_aspect = primary if primary in VEO_ASPECT_RATIOS else DEFAULT_ASPECT_RATIO
+        
+        render_preview = settings.preview_enabled and not video.preview_url
+        render_final = (
+            settings.final_render != "on_demand"
+            or bool(video.final_requested)
+            or not settings.preview_enabled
+        )
+        end_status = VideoStatus.DONE.value if render_final else VideoStatus.PREVIEW_READY.value
+        
+        if not (render_preview or render_final):
+            await asyncio.to_thread(_update_video, video_id, status=end_status, progress=100)
+            return
+        
+        stage_status = dict(STAGE_STATUS)
+        if render_preview or video.preview_url:
+            for name in FINAL_STAGES:
+                stage_status[name] = VideoStatus.PREVIEW_READY.value
+        
+        finished = set()
+        current_status = VideoStatus.GENERATING_SCRIPT.value
+        stages = []  # stages in this run, filled in when the graph is built
+        
+        def progress() -> int:
+            total = sum(STAGE_WEIGHT[name] for name in stages)
+            return sum(STAGE_WEIGHT[name] for name in finished) * 100 // total
+        
+        async def run_script(results: dict) -> dict:
+            script_sections = await script_generator.generate_script(
+                video.product_name,
+                video.product_description or "",
+                video.style,
+                bypass_cache=bool(video.fresh_script)
+            )
+            checkpoint["script"] = script_sections.get("full_script", "")
+            return script_sections
+        
+        async def run_audio(results: dict) -> str:
+            audio_path = await tts_service.generate_audio(
+                results["script"].get("full_script", ""),
+                voice="female",
+                video_id=str(video.id)
+            )
+            checkpoint["audio_url"] = audio_path
+            return audio_path
+        
+        async def run_veo(results: dict) -> list:
+            """Generate Veo clips; a failed clip is returned as None for the fallback stage."""
+            if image_paths:
+                # Generate video from each image (max 2 for cost efficiency)
+                scene_types = ["intro", "main", "outro"]
+                clip_count = len(image_paths[:2])
+                clips_done = 0
+                
+                def clip_done(i: int, ok: bool) -> None:
+                    nonlocal clips_done
+                    clips_done += 1
+                    progress_bus.emit(
+                        video_id,
+                        "progress",
+                        stage="veo",
+                        status=current_status,
+                        progress=progress() + (
+                            STAGE_WEIGHT["veo"] * clips_done * 100
+                            // (clip_count * sum(STAGE_WEIGHT[name] for name in stages))
+                        ),
+                        message=f"clip {i} {'ready' if ok else 'failed'}"
+                    )
+                
+                async def generate_clip(i: int, img_path: str):
+                    scene_type = scene_types[min(i, len(scene_types)-1)]
+                    
+                    # Build prompt for this scene
+                    prompt = veo3_generator.build_product_video_prompt(
+                        video.product_name,
+                        video.product_description or "",
+                        video.style,
+                        scene_type
+                    )
+                    
+                    try:
+                        clip_path = await veo3_generator.generate_video_from_image(
+                            image_path=img_path,
+                            prompt=prompt,
+                            video_id=f"{video.id}_{i}",
+                            aspect_ratio=veo_aspect,
+                            duration_seconds=4  # 4 seconds per clip to save cost
+                        )
+                    except Exception as e:
+                        print(f"Veo 3 generation failed for clip {i}: {e}")
+                        clip_path = None
+                    clip_done(i, clip_path is not None)
+                    return clip_path
+                
+                # Clips are generated concurrently; gather keeps scene order
+                return list(await asyncio.gather(*(
+                    generate_clip(i, img_path)
+                    for i, img_path in enumerate(image_paths[:2])
+                )))
+            
+            # Text-to-video only (no image)
+            prompt = veo3_generator.build_product_video_prompt(
+                video.product_name,
+                video.product_description or "",
+                video.style,
+                "main"
+            )
+            
+            try:
+                return [await veo3_generator.generate_video_from_text(
+                    prompt=prompt,
+                    video_id=str(video.id),
+                    aspect_ratio=veo_aspect,
+                    duration_seconds=8
+                )]
+            except Exception as e:
+                print(f"Text-to-video failed: {e}")
+                return [None]
+        
+        async def run_clips(results: dict) -> dict:
+            """Fill in slideshow fallbacks for clips Veo could not generate, per rendition."""
+            script_sections = results["script"]
+            audio_path = results["audio"]
+            
+            async def fallback(aspect: str, i: int, clip_path):
+                if clip_path:
+                    return clip_path
+                profile = final_profiles[aspect]
+                suffix = _rendition_suffix(aspect, primary)
+                if image_paths:
+                    # Fallback to slideshow for this clip
+                    return await video_generator.generate_video(
+                        video_id=f"{video.id}{suffix}_{i}_fallback",
+                        image_paths=[image_paths[i]],
+                        audio_path=audio_path,
+                        script_sections={"hook": script_sections.get("hook", "")},
+                        style=video.style,
+                        profile=profile
+                    )
+                return await video_generator.generate_video(
+                    video_id=f"{video.id}{suffix}_fallback",
+                    image_paths=[],
+                    audio_path=audio_path,
+                    script_sections=script_sections,
+                    style=video.style,
+                    profile=profile
+                )
+            
+            async def rendition_clips(aspect: str) -> list[str]:
+                return list(await asyncio.gather(*(
+                    fallback(aspect, i, clip_path) for i, clip_path in enumerate(results["veo"])
+                )))
+            
+            clips = await asyncio.gather(*(rendition_clips(aspect) for aspect in aspects))
+            return dict(zip(aspects, clips))
+        
+        async def run_preview(results: dict):
+            """Render the quick low-res slideshow; in auto mode a failure only skips it."""
+            try:
+                preview_path = await video_generator.generate_video(
+                    video_id=f"{video.id}_preview",
+                    image_paths=image_paths,
+                    audio_path=results["audio"],
+                    script_sections=results["script"],
+                    style=video.style,
+                    profile=get_profile("preview", primary)
+                )
+            except Exception as e:
+                if not render_final:
+                    raise
+                print(f"Preview render failed: {e}")
+                if not video.preview_url:
+                    for name in FINAL_STAGES:
+                        stage_status[name] = VideoStatus.GENERATING_VIDEO.value
+                return None
+            
+            checkpoint["preview_url"] = preview_path
+            return preview_path
+        
+        async def run_thumbnail(results: dict) -> None:
+            """Take the poster and thumbnails from the newest render; a failure only skips them."""
+            video_path = (results.get("finish") or {}).get("video_url") or results.get("preview")
+            if not video_path:
+                return
+            try:
+                checkpoint.update(await thumbnailer.create_thumbnails(video_path, str(video.id)))
+            except Exception as e:
+                print(f"Error creating thumbnails: {e}")
+        
+        async def run_finish(results: dict) -> dict:
+            audio_path = results["audio"]
+            
+            async def finish_rendition(aspect: str) -> dict:
+                profile = final_profiles[aspect]
+                generated_clips = results["clips"][aspect]
+                
+                # Combine clips and add audio in one pass
+                output_path = os.path.join(
+                    settings.output_dir,
+                    f"{video.id}{_rendition_suffix(aspect, primary)}.mp4"
+                )
+                try:
+                    video_url = await render_pool.run(
+                        media_encoder.finish,
+                        generated_clips,
+                        output_path,
+                        audio_path=audio_path,
+                        preset=profile.preset,
+                        crf=profile.crf,
+                        size=(profile.width, profile.height),
+                        fps=profile.fps
+                    )
+                except Exception as e:
+                    if len(generated_clips) > 1:
+                        raise
+                    print(f"Audio merge failed: {e}")
+                    video_url = generated_clips[0]
+                
+                return {
+                    "aspect_ratio": aspect,
+                    "width": profile.width,
+                    "height": profile.height,
+                    "video_url": video_url
+                }
+            
+            renditions = await asyncio.gather(*(finish_rendition(aspect) for aspect in aspects))
+            return {
+                "video_url": renditions[0]["video_url"],
+                "renditions": json.dumps(renditions)
+            }
+        
+        final_profiles = {aspect: get_profile("final", aspect) for aspect in aspects}
+        
+        graph = (
+            StageGraph()
+            .add("script", run_script)
+            .add("audio", run_audio, deps=["script"])
+        )
+        if render_preview:
+            graph.add("preview", run_preview, deps=["script", "audio"])
+        if render_final:
+            # Full-res fallback renders wait for the preview so it gets the render pool first
+            (
+                graph
+                .add("veo", run_veo)
+                .add("clips", run_clips, deps=["audio", "veo", *(["preview"] if render_preview else [])])
+                .add("finish", run_finish, deps=["clips", "audio"])
+            )
+        # Posters come from the rendered video, so they match it
+        graph.add("thumbnail", run_thumbnail, deps=["finish" if render_final else "preview"])
+        stages.extend(name for name in STAGE_STATUS if name in graph.stages)
+        
+        def stage_started(stage: str) -> None:
+            progress_bus.emit(
+                video_id, "start", stage=stage, status=current_status, progress=progress()
+            )
+        
+        async def stage_finished(stage: str) -> None:
+            nonlocal current_status
+            finished.add(stage)
+            
+            # Stages overlap, so show the earliest one that is still unfinished
+            status = next(
+                (stage_status[name] for name in stages if name not in finished),
+                current_status
+            )
+            # Take the fields now: running stages can add to the checkpoint during the write
+            fields = dict(checkpoint)
+            checkpoint.clear()
+            if status != current_status or fields:
+                current_status = status
+                await asyncio.to_thread(
+                    _update_video, video_id, status=status, progress=progress(), **fields
+                )
+            progress_bus.emit(
+                video_id,
+                "finish",
+                stage=stage,
+                status=current_status,
+                progress=progress(),
+                fields=_stream_fields(fields)
+            )
+        
+        await asyncio.to_thread(_update_video, video_id, status=current_status, progress=0)
+        
+        results = await graph.run(on_start=stage_started, on_finish=stage_finished)
+        
+        final_fields = {**checkpoint, **results.get("finish", {})}
+        await asyncio.to_thread(
+            _update_video, video_id, status=end_status, progress=100, **final_fields
+        )
+        progress_bus.emit(
+            video_id, "done", status=end_status, progress=100, fields=_stream_fields(final_fields)
+        )
+        
+    except Exception as e:
+        print(f"Video generation failed: {e}")
+        if video is None:
+            return
+        await asyncio.to_thread(
+            _update_video,
+            video_id,
+            status=VideoStatus.FAILED.value,
+            error_message=str(e),
+            **checkpoint
+        )
+        progress_bus.emit(
+            video_id,
+            "failed",
+            status=VideoStatus.FAILED.value,
+            message=str(e),
+            fields={"error_message": str(e)}
+        )
@@ -2,31 +2,46 @@
 AI Video Generator API
 FastAPI application for generating product review videos.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 
 from app.core.config import get_settings
-from app.core.database import engine, Base
 from app.api.videos import router as videos_router
+from app.api.batches import router as batches_router
+from app.api.media import MediaStaticFiles
+from app.api.upload_limit import UploadLimitMiddleware, upload_limits
 from app.schemas.video import HealthResponse
+from app.services.veo3_generator import veo3_generator
+from app.services.render_pool import render_pool
+from app.services.status_stream import status_stream
 
 settings = get_settings()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Create directories
+# Create directories (the database schema is managed by Alembic: `alembic upgrade head`)
 os.makedirs(settings.upload_dir, exist_ok=True)
 os.makedirs(settings.output_dir, exist_ok=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients on startup and close them on shutdown."""
+    await veo3_generator.startup()
+    await status_stream.start()
+    yield
+    await status_stream.stop()
+    await veo3_generator.shutdown()
+    render_pool.shutdown()
+
+
 app = FastAPI(
     title="AI Video Generator API",
     description="Generate product review videos using AI",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -38,11 +53,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Refuse oversized uploads before Starlette spools them to disk
+app.add_middleware(UploadLimitMiddleware, limits=upload_limits())
+
 # Static files for outputs
-app.mount("/outputs", StaticFiles(directory=settings.output_dir), name="outputs")
+app.mount("/outputs", MediaStaticFiles(directory=settings.output_dir), name="outputs")
 
 # Include routers
 app.include_router(videos_router)
+app.include_router(batches_router)
 
 
 @app.get("/", response_model=HealthResponse)
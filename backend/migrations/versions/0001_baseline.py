@@ -0,0 +1,42 @@
+"""Baseline videos table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "videos",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("product_name", sa.String(255), nullable=False),
+        sa.Column("product_description", sa.Text(), nullable=True),
+        sa.Column("style", sa.String(50), nullable=True),
+        sa.Column("status", sa.String(30), nullable=True),
+        sa.Column("script", sa.Text(), nullable=True),
+        sa.Column("audio_url", sa.Text(), nullable=True),
+        sa.Column("video_url", sa.Text(), nullable=True),
+        sa.Column("thumbnail_url", sa.Text(), nullable=True),
+        sa.Column("image_paths", sa.Text(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("videos")
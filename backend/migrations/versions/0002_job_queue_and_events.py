@@ -0,0 +1,62 @@
+"""Job queue bookkeeping, progress and job events
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("videos", sa.Column("fresh_script", sa.Boolean(), nullable=True))
+    op.add_column(
+        "videos",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.add_column("videos", sa.Column("claimed_by", sa.String(255), nullable=True))
+    op.add_column("videos", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "videos",
+        sa.Column("progress", sa.Integer(), nullable=False, server_default="0")
+    )
+
+    op.create_table(
+        "job_events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "video_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("videos.id", ondelete="CASCADE"),
+            nullable=False
+        ),
+        sa.Column("stage", sa.String(30), nullable=True),
+        sa.Column("event", sa.String(20), nullable=False),
+        sa.Column("status", sa.String(30), nullable=True),
+        sa.Column("progress", sa.Integer(), nullable=True),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_job_events_video_id", "job_events", ["video_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_events_video_id", table_name="job_events")
+    op.drop_table("job_events")
+
+    op.drop_column("videos", "progress")
+    op.drop_column("videos", "claimed_at")
+    op.drop_column("videos", "claimed_by")
+    op.drop_column("videos", "attempts")
+    op.drop_column("videos", "fresh_script")
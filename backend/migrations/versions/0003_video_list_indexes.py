@@ -0,0 +1,46 @@
+"""Indexes for newest-first video listing
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_videos_created_at_id": ["created_at", "id"],
+    "ix_videos_status_created_at_id": ["status", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    # Build without locking writes on large tables (CONCURRENTLY can't run in a transaction)
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                "videos",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="videos",
+                postgresql_concurrently=True,
+                if_exists=True
+            )
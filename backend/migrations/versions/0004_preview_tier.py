@@ -0,0 +1,28 @@
+"""Preview tier
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("videos", sa.Column("preview_url", sa.Text(), nullable=True))
+    op.add_column("videos", sa.Column("final_requested", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("videos", "final_requested")
+    op.drop_column("videos", "preview_url")
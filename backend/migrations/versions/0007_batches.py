@@ -0,0 +1,73 @@
+"""Video batches and fair queue order
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_videos_batch_id": ["batch_id"],
+    "ix_videos_status_batch_position_created_at": ["status", "batch_position", "created_at"],
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "video_batches",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=True),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.add_column(
+        "videos",
+        sa.Column(
+            "batch_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("video_batches.id", ondelete="SET NULL"),
+            nullable=True
+        )
+    )
+    op.add_column(
+        "videos",
+        sa.Column("batch_position", sa.Integer(), nullable=False, server_default="0")
+    )
+
+    # Build without locking writes on large tables (CONCURRENTLY can't run in a transaction)
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                "videos",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="videos",
+                postgresql_concurrently=True,
+                if_exists=True
+            )
+
+    op.drop_column("videos", "batch_position")
+    op.drop_column("videos", "batch_id")
+    op.drop_table("video_batches")
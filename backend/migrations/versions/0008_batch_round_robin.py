@@ -0,0 +1,26 @@
+"""Round-robin turn of video batches
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("video_batches", sa.Column("last_claimed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("video_batches", "last_claimed_at")
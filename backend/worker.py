@@ -0,0 +1,205 @@
+"""
+AI Video Generator Worker
+Claims queued video jobs from the database and renders them at a fixed concurrency.
+
+Run one or more of these next to the API:
+    python worker.py --concurrency 2
+"""
+import os
+import socket
+import signal
+import asyncio
+import argparse
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.services.job_queue import job_queue
+from app.services.video_pipeline import process_video_generation
+from app.services.veo3_generator import veo3_generator
+from app.services.render_pool import render_pool
+from app.services.progress_bus import progress_bus
+from app.services.tts_service import tts_service
+
+settings = get_settings()
+
+
+class Worker:
+    """
+    Runs up to `concurrency` video jobs at a time.
+
+    Batch jobs may only fill `batch_slots` of them; the rest stay free for
+    single-video requests, so a catalog batch cannot occupy the whole worker.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.batch_slots = max(concurrency - settings.worker_interactive_slots, 1)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.running: dict[str, asyncio.Task] = {}
+        self.running_batch: set[str] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _claim(self, include_batches: bool):
+        db = SessionLocal()
+        try:
+            return job_queue.claim_next(db, self.worker_id, include_batches)
+        finally:
+            db.close()
+
+    def _heartbeat(self, video_ids: list[str]) -> None:
+        db = SessionLocal()
+        try:
+            job_queue.heartbeat(db, video_ids, self.worker_id)
+            job_queue.fail_exhausted(db)
+        finally:
+            db.close()
+
+    def _complete(self, video_id: str) -> None:
+        db = SessionLocal()
+        try:
+            job_queue.complete(db, [video_id], self.worker_id)
+        finally:
+            db.close()
+
+    def _release(self, video_ids: list[str]) -> None:
+        db = SessionLocal()
+        try:
+            job_queue.release(db, video_ids, self.worker_id)
+        finally:
+            db.close()
+
+    def _log_cache_stats(self) -> None:
+        stats = render_pool.cache_stats()
+        print(
+            f"Worker {self.worker_id} asset cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['size']} assets in {stats['processes']} pool processes"
+        )
+        stats = tts_service.cache_stats()
+        print(
+            f"Worker {self.worker_id} TTS audio store: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%})"
+        )
+
+    async def _heartbeat_loop(self) -> None:
+        interval = max(settings.job_stale_after / 3, 1)
+        loop = asyncio.get_running_loop()
+        stats_due = loop.time() + settings.worker_stats_interval
+        while not self._stopping.is_set():
+            try:
+                await asyncio.to_thread(self._heartbeat, list(self.running))
+            except Exception as e:
+                print(f"Worker heartbeat failed: {e}")
+            if loop.time() >= stats_due:
+                self._log_cache_stats()
+                stats_due = loop.time() + settings.worker_stats_interval
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, video_id: str) -> None:
+        try:
+            await process_video_generation(video_id)
+            await asyncio.to_thread(self._complete, video_id)
+        except Exception as e:
+            print(f"Failed to complete job {video_id}: {e}")
+        finally:
+            self.running.pop(video_id, None)
+            self.running_batch.discard(video_id)
+            self._slots.release()
+
+    async def _wait_for_slot(self) -> bool:
+        """Wait for a free slot; returns False if the worker is stopping instead."""
+        acquire = asyncio.create_task(self._slots.acquire())
+        stopping = asyncio.create_task(self._stopping.wait())
+        await asyncio.wait({acquire, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+
+        if self._stopping.is_set():
+            if acquire.done():
+                self._slots.release()
+            else:
+                acquire.cancel()
+            return False
+        return True
+
+    async def run(self) -> None:
+        self._slots = asyncio.Semaphore(self.concurrency)
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        print(f"Worker {self.worker_id} started with concurrency {self.concurrency}")
+
+        try:
+            while not self._stopping.is_set():
+                if not await self._wait_for_slot():
+                    break
+
+                include_batches = len(self.running_batch) < self.batch_slots
+                try:
+                    claimed = await asyncio.to_thread(self._claim, include_batches)
+                except Exception as e:
+                    print(f"Failed to claim job: {e}")
+                    claimed = None
+
+                if not claimed:
+                    self._slots.release()
+                    try:
+                        await asyncio.wait_for(
+                            self._stopping.wait(),
+                            timeout=settings.worker_poll_interval
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                video_id, from_batch = claimed
+                if from_batch:
+                    self.running_batch.add(video_id)
+                self.running[video_id] = asyncio.create_task(self._run_job(video_id))
+        finally:
+            # Interrupted jobs go straight back on the queue for another worker
+            interrupted = list(self.running)
+            for task in self.running.values():
+                task.cancel()
+            await asyncio.gather(*self.running.values(), return_exceptions=True)
+            if interrupted:
+                await asyncio.to_thread(self._release, interrupted)
+
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self._log_cache_stats()
+            print(f"Worker {self.worker_id} stopped")
+
+
+async def main(concurrency: int) -> None:
+    worker = Worker(concurrency)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    await veo3_generator.startup()
+    try:
+        await worker.run()
+    finally:
+        await veo3_generator.shutdown()
+        await progress_bus.stop()
+        render_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Video generation worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.worker_concurrency,
+        help="Number of jobs to render at once"
+    )
+    args = parser.parse_args()
+
+    os.makedirs(settings.upload_dir, exist_ok=True)
+    os.makedirs(settings.output_dir, exist_ok=True)
+
+    asyncio.run(main(args.concurrency))
@@ -2,7 +2,7 @@
 
 import { Button } from '@/components/ui/button';
 import { Card, CardContent } from '@/components/ui/card';
-import { getVideoDownloadUrl, getVideoStreamUrl, VideoResponse } from '@/lib/api';
+import { getVideoDownloadUrl, getVideoStreamUrl, getVideoThumbnailUrl, VideoResponse } from '@/lib/api';
 
 interface VideoPlayerProps {
     video: VideoResponse;
@@ -12,6 +12,7 @@ interface VideoPlayerProps {
 export function VideoPlayer({ video, onCreateNew }: VideoPlayerProps) {
     const videoUrl = video.video_url ? getVideoStreamUrl(video.video_url) : '';
     const downloadUrl = getVideoDownloadUrl(video.id);
+    const posterUrl = video.poster_url ? getVideoThumbnailUrl(video.id, 720) : undefined;
 
     return (
         <Card className="w-full overflow-hidden">
@@ -21,6 +22,7 @@ export function VideoPlayer({ video, onCreateNew }: VideoPlayerProps) {
                     {videoUrl ? (
                         <video
                             src={videoUrl}
+                            poster={posterUrl}
                             controls
                             autoPlay
                             loop
@@ -3,8 +3,15 @@
 import { useState, useEffect } from 'react';
 import { Progress } from '@/components/ui/progress';
 import { Badge } from '@/components/ui/badge';
+import { Button } from '@/components/ui/button';
 import { Card, CardContent } from '@/components/ui/card';
-import { getVideoStatus, VideoStatusResponse } from '@/lib/api';
+import {
+    finalizeVideo,
+    getVideoStatus,
+    getVideoStatusStreamUrl,
+    getVideoStreamUrl,
+    VideoStatusResponse,
+} from '@/lib/api';
 
 interface VideoStatusTrackerProps {
     videoId: string;
@@ -18,6 +25,7 @@ const STATUS_PROGRESS: Record<string, number> = {
     generating_script: 35,
     generating_audio: 55,
     generating_video: 80,
+    preview_ready: 90,
     done: 100,
     failed: 0,
 };
@@ -28,6 +36,7 @@ const STATUS_LABELS: Record<string, string> = {
     generating_script: 'Membuat Script Review',
     generating_audio: 'Membuat Voice Over',
     generating_video: 'Membuat Video',
+    preview_ready: 'Preview Siap',
     done: 'Selesai!',
     failed: 'Gagal',
 };
@@ -35,36 +44,91 @@ const STATUS_LABELS: Record<string, string> = {
 export function VideoStatusTracker({ videoId, onComplete, onError }: VideoStatusTrackerProps) {
     const [status, setStatus] = useState<VideoStatusResponse | null>(null);
     const [progress, setProgress] = useState(0);
+    // Bumped to start tracking again once a final render is requested
+    const [trackingRun, setTrackingRun] = useState(0);
+    const [finalizing, setFinalizing] = useState(false);
+    const [finalizeError, setFinalizeError] = useState<string | null>(null);
+
+    const handleFinalize = async () => {
+        setFinalizing(true);
+        setFinalizeError(null);
+        try {
+            await finalizeVideo(videoId);
+            setStatus((current) => current && { ...current, status: 'pending', awaiting_final: false });
+            setTrackingRun((run) => run + 1);
+        } catch (error) {
+            setFinalizeError(error instanceof Error ? error.message : 'Failed to request the final video');
+        } finally {
+            setFinalizing(false);
+        }
+    };
 
     useEffect(() => {
+        let interval: ReturnType<typeof setInterval> | undefined;
+        let finished = false;
+
+        const applyStatus = (result: VideoStatusResponse) => {
+            if (finished) return;
+            setStatus(result);
+            // Stages overlap, so a later update can carry a lower figure
+            const next = result.progress || STATUS_PROGRESS[result.status] || 0;
+            setProgress((current) => Math.max(current, next));
+
+            if (result.status === 'done') {
+                finished = true;
+                onComplete(result);
+            } else if (result.status === 'failed') {
+                finished = true;
+                onError(result.error_message || 'Video generation failed');
+            } else if (result.awaiting_final) {
+                // The job stopped at its preview; nothing changes until /finalize
+                finished = true;
+            }
+        };
+
         const checkStatus = async () => {
             try {
-                const result = await getVideoStatus(videoId);
-                setStatus(result);
-                setProgress(STATUS_PROGRESS[result.status] || 0);
-
-                if (result.status === 'done') {
-                    onComplete(result);
-                } else if (result.status === 'failed') {
-                    onError(result.error_message || 'Video generation failed');
-                }
+                applyStatus(await getVideoStatus(videoId));
             } catch (error) {
                 console.error('Error checking status:', error);
             }
         };
 
-        // Initial check
-        checkStatus();
+        const startPolling = () => {
+            if (interval || finished) return;
+            checkStatus();
+            // Poll every 2 seconds until done, failed or waiting at the preview
+            interval = setInterval(() => {
+                if (finished) {
+                    clearInterval(interval);
+                } else {
+                    checkStatus();
+                }
+            }, 2000);
+        };
 
-        // Poll every 2 seconds until done or failed
-        const interval = setInterval(() => {
-            if (status?.status !== 'done' && status?.status !== 'failed') {
-                checkStatus();
-            }
-        }, 2000);
+        // Status pushes over Server-Sent Events; fall back to polling without them
+        let source: EventSource | undefined;
+        if (typeof EventSource !== 'undefined') {
+            source = new EventSource(getVideoStatusStreamUrl([videoId]));
+            source.addEventListener('status', (event) => {
+                applyStatus(JSON.parse((event as MessageEvent).data));
+                if (finished) source?.close();
+            });
+            source.onerror = () => {
+                source?.close();
+                startPolling();
+            };
+        } else {
+            startPolling();
+        }
 
-        return () => clearInterval(interval);
-    }, [videoId, status?.status, onComplete, onError]);
+        return () => {
+            finished = true;
+            source?.close();
+            if (interval) clearInterval(interval);
+        };
+    }, [videoId, onComplete, onError, trackingRun]);
 
     return (
         <Card className="w-full">
@@ -100,8 +164,30 @@ export function VideoStatusTracker({ videoId, onComplete, onError }: VideoStatus
                     </p>
                 )}
 
+                {/* Low-res preview while the final video renders */}
+                {status?.preview_url && status.status !== 'done' && (
+                    <video
+                        src={getVideoStreamUrl(status.preview_url)}
+                        className="w-full max-w-xs mx-auto rounded-lg"
+                        controls
+                        playsInline
+                    />
+                )}
+
+                {/* Final render on request (FINAL_RENDER=on_demand) */}
+                {status?.awaiting_final && (
+                    <div className="flex flex-col items-center gap-2">
+                        <Button onClick={handleFinalize} disabled={finalizing}>
+                            {finalizing ? 'Memproses...' : 'Buat Video Final'}
+                        </Button>
+                        {finalizeError && (
+                            <p className="text-sm text-red-600 dark:text-red-400">{finalizeError}</p>
+                        )}
+                    </div>
+                )}
+
                 {/* Processing Animation */}
-                {status?.status && !['done', 'failed'].includes(status.status) && (
+                {status?.status && !['done', 'failed'].includes(status.status) && !status.awaiting_final && (
                     <div className="flex justify-center">
                         <div className="flex gap-1">
                             {[0, 1, 2].map((i) => (
@@ -5,6 +5,14 @@ export interface VideoRequest {
     productDescription: string;
     style: 'luxury' | 'minimal' | 'tech' | 'lifestyle';
     images: File[];
+    renditions?: string[];
+}
+
+export interface Rendition {
+    aspect_ratio: string;
+    width: number | null;
+    height: number | null;
+    video_url: string | null;
 }
 
 export interface VideoResponse {
@@ -16,7 +24,10 @@ export interface VideoResponse {
     script: string | null;
     audio_url: string | null;
     video_url: string | null;
+    preview_url: string | null;
+    poster_url: string | null;
     thumbnail_url: string | null;
+    renditions: Rendition[] | null;
     error_message: string | null;
     created_at: string;
     updated_at: string;
@@ -26,8 +37,11 @@ export interface VideoStatusResponse {
     id: string;
     status: string;
     video_url: string | null;
+    preview_url: string | null;
     error_message: string | null;
+    progress: number;
     progress_message: string;
+    awaiting_final: boolean;
 }
 
 export async function createVideo(data: VideoRequest): Promise<VideoResponse> {
@@ -35,6 +49,9 @@ export async function createVideo(data: VideoRequest): Promise<VideoResponse> {
     formData.append('product_name', data.productName);
     formData.append('product_description', data.productDescription);
     formData.append('style', data.style);
+    if (data.renditions?.length) {
+        formData.append('renditions', data.renditions.join(','));
+    }
 
     data.images.forEach((image) => {
         formData.append('images', image);
@@ -72,8 +89,37 @@ export async function getVideoStatus(videoId: string): Promise<VideoStatusRespon
     return response.json();
 }
 
-export function getVideoDownloadUrl(videoId: string): string {
-    return `${API_BASE_URL}/api/videos/${videoId}/download`;
+export async function finalizeVideo(videoId: string): Promise<VideoResponse> {
+    const response = await fetch(`${API_BASE_URL}/api/videos/${videoId}/finalize`, {
+        method: 'POST',
+    });
+
+    if (!response.ok) {
+        throw new Error('Failed to request the final video');
+    }
+
+    return response.json();
+}
+
+export function getVideoStatusStreamUrl(videoIds: string[]): string {
+    return `${API_BASE_URL}/api/videos/stream?ids=${videoIds.map(encodeURIComponent).join(',')}`;
+}
+
+export function getVideoDownloadUrl(videoId: string, aspectRatio?: string): string {
+    const url = `${API_BASE_URL}/api/videos/${videoId}/download`;
+    return aspectRatio ? `${url}?aspect_ratio=${encodeURIComponent(aspectRatio)}` : url;
+}
+
+export function getVideoThumbnailUrl(
+    videoId: string,
+    width?: number,
+    format: 'webp' | 'jpeg' = 'webp'
+): string {
+    const params = new URLSearchParams({ format });
+    if (width) {
+        params.set('width', String(width));
+    }
+    return `${API_BASE_URL}/api/videos/${videoId}/thumbnail?${params}`;
 }
 
 export function getVideoStreamUrl(videoPath: string): string {